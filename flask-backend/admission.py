@@ -0,0 +1,72 @@
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+class AdmissionGate:
+    """Caps how many requests of one endpoint group run at once.
+
+    Up to `limit` requests run; up to `max_waiting` more wait at most
+    `wait_timeout` seconds for a slot, and anything beyond that is turned away
+    at once, so a burst is answered with a quick 429 instead of piling up on
+    the server's threads. Each group has its own gate, so a flood of one kind
+    of request never takes the slots of another.
+    """
+
+    def __init__(self, name: str, limit: int, max_waiting: int, wait_timeout: float = 5.0):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_waiting = max(0, max_waiting)
+        self.wait_timeout = wait_timeout
+        self._condition = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        # Moving average of how long a request holds its slot, for Retry-After.
+        self._average_hold = 1.0
+
+    def acquire(self) -> Optional[float]:
+        """Take a slot, waiting if the queue has room; returns the admission time, or None if refused."""
+        with self._condition:
+            if self.active >= self.limit:
+                if self.waiting >= self.max_waiting:
+                    self.rejected += 1
+                    return None
+                self.waiting += 1
+                deadline = time.monotonic() + self.wait_timeout
+                try:
+                    while self.active >= self.limit:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.rejected += 1
+                            return None
+                        self._condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+            self.admitted += 1
+            return time.monotonic()
+
+    def release(self, admitted_at: float):
+        with self._condition:
+            self.active -= 1
+            self._average_hold = 0.8 * self._average_hold + 0.2 * (time.monotonic() - admitted_at)
+            self._condition.notify()
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to be free, for the Retry-After header."""
+        with self._condition:
+            return max(1, math.ceil(self._average_hold * (self.waiting + 1) / self.limit))
+
+    def stats(self) -> Dict[str, float]:
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "max_waiting": self.max_waiting,
+                "active": self.active,
+                "waiting": self.waiting,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "average_hold_seconds": round(self._average_hold, 3)
+            }
@@ -1,9 +1,12 @@
+import bisect
 import difflib
 import json
 import os
 import logging
 import random
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import Callable, List, Dict, Optional
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
@@ -20,6 +23,8 @@ class DictionaryHelper:
         'J': 0.15, 'K': 0.77, 'L': 4.0, 'M': 2.4, 'N': 6.7, 'O': 7.5, 'P': 1.9, 'Q': 0.095, 'R': 6.0,
         'S': 6.3, 'T': 9.1, 'U': 2.8, 'V': 0.98, 'W': 2.4, 'X': 0.15, 'Y': 2.0, 'Z': 0.074
     }
+
+    STOP_CHECK_INTERVAL = 1024
     
     def __init__(self, dictionary_path: str):
         self.dictionary_path = dictionary_path
@@ -28,12 +33,22 @@ class DictionaryHelper:
         self.word_count_by_length = defaultdict(int)
         self.all_words = []
         self.word_to_data = {}
+        self.position_letter_masks = {}
+        self.words_by_clue = {}
+        self._clue_text = ''
+        self._clue_starts = []
+        started = time.perf_counter()
         self._load_dictionary()
+        self._build_position_letter_index()
+        self._build_clue_index()
+        # Reported by /health and profile_startup.py, since it dominates worker boot.
+        self.load_seconds = time.perf_counter() - started
         
     def _load_dictionary(self):
         logger.info("Loading dictionary...")
         
-        for filename in os.listdir(self.dictionary_path):
+        # Sorted so the word order, and with it every seeded generation, is the same on every machine.
+        for filename in sorted(os.listdir(self.dictionary_path)):
             if filename.endswith('.json'):
                 file_path = os.path.join(self.dictionary_path, filename)
                 try:
@@ -67,6 +82,55 @@ class DictionaryHelper:
                     logger.error(f"Error loading dictionary file {filename}: {e}")
         
         logger.info(f"Dictionary loaded: {len(self.all_words)} valid crossword words")
+
+    def _build_position_letter_index(self):
+        for length, words in self.words_by_length.items():
+            positions = [defaultdict(list) for _ in range(length)]
+            for index, word_data in enumerate(words):
+                for i, char in enumerate(word_data['word']):
+                    positions[i][char].append(index)
+
+            total = len(words)
+            masks = []
+            for position in positions:
+                position_masks = {}
+                for char, indices in position.items():
+                    bits = bytearray((total + 7) // 8)
+                    for index in indices:
+                        bits[index >> 3] |= 1 << (index & 7)
+                    position_masks[char] = int.from_bytes(bits, 'little')
+                masks.append(position_masks)
+
+            self.position_letter_masks[length] = masks
+
+    def _build_clue_index(self):
+        # All lower-cased clues joined into one string, so substring lookups run as a
+        # single str.find sweep instead of a Python loop over every word.
+        lowered = []
+        offset = 0
+        for word_data in self.all_words:
+            clue_lower = word_data['clue'].lower()
+            self.words_by_clue.setdefault(clue_lower, word_data)
+            self._clue_starts.append(offset)
+            lowered.append(clue_lower)
+            offset += len(clue_lower) + 1
+        self._clue_text = '\x00'.join(lowered)
+
+    def _iter_clue_matches(self, clue_lower: str):
+        if not clue_lower or '\x00' in clue_lower:
+            for word_data in self.all_words:
+                if clue_lower in word_data['clue'].lower():
+                    yield word_data
+            return
+
+        starts = self._clue_starts
+        position = self._clue_text.find(clue_lower)
+        while position != -1:
+            index = bisect.bisect_right(starts, position) - 1
+            yield self.all_words[index]
+            if index + 1 >= len(starts):
+                return
+            position = self._clue_text.find(clue_lower, starts[index + 1])
         
     def _is_valid_crossword_word(self, word: str) -> bool:
         if not word.isalpha():
@@ -120,6 +184,13 @@ class DictionaryHelper:
     def get_word_count_by_length(self, length: int) -> int:
         return self.word_count_by_length.get(length, 0)
         
+    def count_pattern_matches(self, pattern: str) -> int:
+        """Count words fitting a pattern like 'Q..T' using the per-length (position, letter) bitmasks."""
+        matches = self._pattern_mask(pattern)
+        if matches is None:
+            return self.word_count_by_length.get(len(pattern), 0)
+        return matches.bit_count()
+
     def get_words_by_length(self, length: int, max_words: int = None) -> List[Dict]:
         words = self.words_by_length.get(length, [])
         
@@ -155,10 +226,7 @@ class DictionaryHelper:
         return words[:max_words] if max_words else words
         
     def find_word_by_exact_clue(self, clue: str) -> Optional[Dict]:
-        for word_data in self.all_words:
-            if word_data['clue'].lower() == clue.lower():
-                return word_data
-        return None
+        return self.words_by_clue.get(clue.lower())
         
     def get_possible_words(self, clue: str, max_words: int = 50, 
                           length_range: tuple = None) -> List[Dict]:
@@ -169,16 +237,15 @@ class DictionaryHelper:
         if exact_match:
             results.append(exact_match)
         
-        for word_data in self.all_words:
-            if clue_lower in word_data['clue'].lower():
-                if length_range:
-                    word_len = len(word_data['word'])
-                    if word_len < length_range[0] or word_len > length_range[1]:
-                        continue
-                
-                results.append(word_data)
-                if len(results) >= max_words:
-                    break
+        for word_data in self._iter_clue_matches(clue_lower):
+            if length_range:
+                word_len = len(word_data['word'])
+                if word_len < length_range[0] or word_len > length_range[1]:
+                    continue
+            
+            results.append(word_data)
+            if len(results) >= max_words:
+                break
         
         return results
         
@@ -188,25 +255,45 @@ class DictionaryHelper:
         pattern_len = len(pattern)
         
         candidate_words = self.words_by_length.get(pattern_len, [])
+        matches = self._pattern_mask(pattern)
+        if matches == 0:
+            return results
         
-        for word_data in candidate_words:
-            word = word_data['word'].upper()
-            matches = True
-            
-            for i, char in enumerate(pattern):
-                if char != '.' and char != word[i]:
-                    matches = False
-                    break
-            
-            if matches:
-                if clue and clue.lower() not in word_data['clue'].lower():
-                    continue
-                    
-                results.append(word_data)
-                if len(results) >= max_words:
-                    break
+        for word_data in self._iter_mask_words(candidate_words, matches):
+            if clue and clue.lower() not in word_data['clue'].lower():
+                continue
+                
+            results.append(word_data)
+            if len(results) >= max_words:
+                break
         
         return results
+
+    def _pattern_mask(self, pattern: str) -> Optional[int]:
+        """AND of the (position, letter) masks for a pattern; None when no letter is fixed."""
+        masks = self.position_letter_masks.get(len(pattern))
+        if masks is None:
+            return 0
+
+        matches = None
+        for i, char in enumerate(pattern):
+            if char == '.':
+                continue
+            mask = masks[i].get(char, 0)
+            matches = mask if matches is None else matches & mask
+            if not matches:
+                return 0
+        return matches
+
+    def _iter_mask_words(self, words: List[Dict], mask: Optional[int]):
+        if mask is None:
+            yield from words
+            return
+
+        while mask:
+            lowest = mask & -mask
+            yield words[lowest.bit_length() - 1]
+            mask ^= lowest
         
     def get_clue_for_word(self, word: str) -> Dict:
         word_upper = word.upper()
@@ -216,17 +303,18 @@ class DictionaryHelper:
             'score': self._calculate_word_score(word_upper)
         })
         
-    def get_random_word(self, length: int = None, max_words: int = None) -> Dict:
+    def get_random_word(self, length: int = None, max_words: int = None, rng: random.Random = None) -> Dict:
+        rng = rng or random
         if length:
             words = self.words_by_length.get(length, [])
             if max_words:
                 words = words[:max_words]
-            return random.choice(words) if words else None
+            return rng.choice(words) if words else None
         else:
             words = self.all_words
             if max_words:
                 words = words[:max_words]
-            return random.choice(words) if words else None
+            return rng.choice(words) if words else None
             
     def get_words_with_common_letters(self, letters: str, max_words: int = 20) -> List[Dict]:
         results = []
@@ -241,17 +329,25 @@ class DictionaryHelper:
         
         return results
     
-    def get_alternative_spellings(self, clue: str, length: int, max_words: int = 20) -> List[Dict]:
+    def get_alternative_spellings(self, clue: str, length: int, max_words: int = 20,
+                                  should_stop: Optional[Callable[[], bool]] = None) -> List[Dict]:
+        """Words whose clue reads like `clue`. The fuzzy scan covers the whole
+        dictionary, so `should_stop` is polled every STOP_CHECK_INTERVAL words and
+        ends it early with the matches found so far."""
 
         clue_lower = clue.lower()
         results = []
 
-        for word_data in self.all_words:
+        for i, word_data in enumerate(self.all_words):
+            if should_stop is not None and i % self.STOP_CHECK_INTERVAL == 0 and should_stop():
+                return results
             if abs(len(word_data['word']) - length) > 1:
                 continue
 
-            similarity = difflib.SequenceMatcher(None, clue_lower, word_data['clue'].lower()).ratio()
-            if similarity > 0.6:
+            # real_quick_ratio and quick_ratio are cheap upper bounds on ratio,
+            # so most clues are rejected without the full comparison.
+            matcher = difflib.SequenceMatcher(None, clue_lower, word_data['clue'].lower())
+            if matcher.real_quick_ratio() > 0.6 and matcher.quick_ratio() > 0.6 and matcher.ratio() > 0.6:
                 results.append(word_data)
                 if len(results) >= max_words:
                     break
@@ -267,4 +363,15 @@ class DictionaryHelper:
             logger.debug(f"[Fallback] No fuzzy matches for '{clue}', using random words.")
             results = self.get_words_by_length(length, max_words=max_words)
 
-        return results
\ No newline at end of file
+        return results
+
+_shared_helpers: Dict[str, DictionaryHelper] = {}
+_shared_lock = threading.Lock()
+
+def shared_dictionary(dictionary_path: str = "dictionary") -> DictionaryHelper:
+    """The one DictionaryHelper per path that every module of this process uses, built on first call."""
+    with _shared_lock:
+        helper = _shared_helpers.get(dictionary_path)
+        if helper is None:
+            helper = _shared_helpers[dictionary_path] = DictionaryHelper(dictionary_path)
+        return helper
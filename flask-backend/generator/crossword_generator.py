@@ -2,11 +2,12 @@
 from collections import defaultdict
 import random
 import string
+import time
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
-from dictionary_helper import DictionaryHelper
+from dictionary_helper import shared_dictionary
 
-dict_helper = DictionaryHelper("dictionary")
+dict_helper = shared_dictionary("dictionary")
 
 @dataclass
 class Point:
@@ -24,7 +25,7 @@ class WordSlot:
     clue: str = ""
         
 class CrosswordGenerator:
-    def __init__(self, width=15, height=15, grid=None, words=None):
+    def __init__(self, width=15, height=15, grid=None, words=None, rng: Optional[random.Random] = None):
         self.width = width
         self.height = height
         self.grid = grid or [['.' for _ in range(width)] for _ in range(height)]
@@ -33,6 +34,12 @@ class CrosswordGenerator:
         self.word_cache = {}
         self.word_scores = {}
         self.used_starting_letters = set()
+        # Every random choice goes through this instance, so a seeded rng makes the puzzle
+        # reproducible and concurrent generators never share state.
+        self.rng = rng or random.Random()
+        # Absolute time.time() at which generate() wraps up with the best puzzle so far.
+        self.deadline: Optional[float] = None
+        self.budget_exhausted = False
 
     def get_optimized_word_list(self, max_length):
         # Get a diverse set of words with different starting letters
@@ -42,9 +49,14 @@ class CrosswordGenerator:
             words.extend(dict_helper.get_words_by_length(length, 20))
         
         # Sort by score but add some randomness
-        words.sort(key=lambda x: (-x['score'], random.random()))
+        words.sort(key=lambda x: (-x['score'], self.rng.random()))
         return words
 
+    def _out_of_time(self) -> bool:
+        if not self.budget_exhausted and self.deadline is not None and time.time() >= self.deadline:
+            self.budget_exhausted = True
+        return self.budget_exhausted
+
     def _calculate_word_placement_score(self, word):
         # Use the score from the dictionary helper
         return dict_helper._calculate_word_score(word)
@@ -58,6 +70,8 @@ class CrosswordGenerator:
             return None
             
         for attempt in range(max_attempts):
+            if self._out_of_time():
+                break
             if not word_list:
                 word_list = self.get_optimized_word_list(self.width)
                 
@@ -66,6 +80,8 @@ class CrosswordGenerator:
                 
             puzzles = []
             for vertical in [False, True]:
+                if vertical and self._out_of_time():
+                    break
                 puzzle = self._place_initial_word(initial_word, vertical)
                 if puzzle:
                     final_puzzle = self._generate_and_finalize(puzzle, word_list)
@@ -83,7 +99,7 @@ class CrosswordGenerator:
                     self.used_starting_letters.add(initial_word[0].lower())
                 
                 # Simple selection - just pick a random word from the list
-                initial_word_dict = random.choice(word_list[:min(10, len(word_list))])
+                initial_word_dict = self.rng.choice(word_list[:min(10, len(word_list))])
                 initial_word = initial_word_dict['word']
             else:
                 break
@@ -108,10 +124,10 @@ class CrosswordGenerator:
         unused_letter_words = [w for w in word_list if w['word'][0].lower() not in self.used_starting_letters]
         
         if unused_letter_words:
-            return random.choice(unused_letter_words[:min(5, len(unused_letter_words))])['word']
+            return self.rng.choice(unused_letter_words[:min(5, len(unused_letter_words))])['word']
         else:
             # If all letters have been used, just pick a random word
-            return random.choice(word_list[:10])['word']
+            return self.rng.choice(word_list[:10])['word']
 
     def _calculate_placement_potential(self, puzzle, x, y, vertical, word):
         potential = 0
@@ -147,7 +163,7 @@ class CrosswordGenerator:
         final_puzzle = self._generate(base_puzzle, word_list, max_attempts)
         
         iteration = 0
-        while len(final_puzzle.words) > len(base_puzzle.words):
+        while len(final_puzzle.words) > len(base_puzzle.words) and not self._out_of_time():
             iteration += 1
             # logging.debug(f"Expansion iteration {iteration}: {len(final_puzzle.words)} words")
             base_puzzle = final_puzzle
@@ -165,6 +181,8 @@ class CrosswordGenerator:
         options = []
         
         for i, char in enumerate(word):
+            if self._out_of_time():
+                break
             for y in range(self.height):
                 for x in range(self.width):
                     if puzzle.grid[y][x] == char:
@@ -193,7 +211,7 @@ class CrosswordGenerator:
         current_puzzle = puzzle
         
         for attempt in range(max_attempts):
-            if not word_list and not tried_words:
+            if not word_list and not tried_words or self._out_of_time():
                 break
                 
             if not word_list:
@@ -323,7 +341,8 @@ class CrosswordGenerator:
             width=self.width,
             height=self.height,
             grid=new_grid,
-            words=new_words
+            words=new_words,
+            rng=self.rng
         )
         new_puzzle.empty_grid = new_empty_grid
         return new_puzzle
@@ -354,7 +373,8 @@ class CrosswordGenerator:
             width=self.width,
             height=self.height,
             grid=new_grid,
-            words=new_words
+            words=new_words,
+            rng=self.rng
         )
     
     def analyze_grid(self, for_empty_grid=False) -> Tuple[List[WordSlot], List[WordSlot]]:
@@ -0,0 +1,192 @@
+import logging
+import random
+import secrets
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .crossword_generator import CrosswordGenerator
+
+logger = logging.getLogger(__name__)
+
+class PuzzleBuildError(Exception):
+    """No puzzle could be built; `message` tells the user what to try instead."""
+
+    def __init__(self, error: str, message: str):
+        super().__init__(error)
+        self.message = message
+
+    def __reduce__(self):
+        # Keeps both fields when the error comes back from a worker process.
+        return (PuzzleBuildError, (str(self), self.message))
+
+DENSITY_BOUNDS = {
+    'easy': (0.35, 0.50),
+    'medium': (0.60, 0.69),
+    'hard': (0.80, 1.00)
+}
+
+MAX_GENERATION_TRIES = 15
+
+def _settings(size: int, difficulty: str) -> Dict:
+    if difficulty == 'easy':
+        return {"min_word_length": max(3, size//3), "max_word_length": min(12, size),
+                "max_attempts": 3, "word_count_multiplier": 0.7}
+    if difficulty == 'hard':
+        return {"min_word_length": 3, "max_word_length": size,
+                "max_attempts": 5, "word_count_multiplier": 1.3}
+    return {"min_word_length": max(3, size//4), "max_word_length": min(10, size),
+            "max_attempts": 4, "word_count_multiplier": 1.0}
+
+def plan_build(size: int, difficulty: str, dict_helper, seed: int) -> Tuple[int, List[int]]:
+    """Derive from `seed` the initial word length every attempt of one build starts
+    from and one seed per attempt, so a build's result depends on nothing else."""
+    rng = random.Random(seed)
+    settings = _settings(size, difficulty)
+    initial_length = rng.randint(settings["min_word_length"], min(settings["max_word_length"], size//2))
+    if not dict_helper.get_words_by_length(length=initial_length, max_words=100):
+        raise PuzzleBuildError("No suitable initial words found", "Try a smaller grid size or different difficulty")
+    return initial_length, [rng.getrandbits(64) for _ in range(MAX_GENERATION_TRIES)]
+
+def new_seed() -> int:
+    return secrets.randbits(63)
+
+def in_density_bounds(puzzle: Dict) -> bool:
+    min_density, max_density = DENSITY_BOUNDS[puzzle["stats"]["difficulty"]]
+    return min_density <= puzzle["stats"]["density"] <= max_density
+
+def build_attempt(size: int, difficulty: str, attempt: int, initial_length: int, dict_helper,
+                  seed: int, deadline: Optional[float] = None) -> Optional[Dict]:
+    """Run one generator attempt and return its puzzle as a /generate body, or None.
+
+    All of the attempt's randomness comes from its own `seed`, so attempts can run
+    in any order, thread or process and still build the same puzzles. At the
+    absolute `deadline` the generator stops expanding and returns what it has.
+    """
+    if deadline is not None and time.time() >= deadline:
+        return None
+    rng = random.Random(seed)
+    settings = _settings(size, difficulty)
+    target_word_count = int(size * 1.5 * settings["word_count_multiplier"])
+    possible_words = dict_helper.get_words_by_length(length=initial_length, max_words=100)
+
+    logger.info(f"Generation attempt {attempt + 1}/{MAX_GENERATION_TRIES} [diff={difficulty}]")
+
+    word_list = []
+    dynamic_max_len = settings["max_word_length"] + (attempt % 2)
+    for length in range(settings["min_word_length"], dynamic_max_len + 1):
+        if deadline is not None and time.time() >= deadline:
+            return None
+        words = dict_helper.get_words_by_length(
+            length=length,
+            max_words=int(target_word_count / 2) + rng.randint(0, 20)
+        )
+        word_list.extend(words)
+    rng.shuffle(word_list)
+
+    initial_word = rng.choice(possible_words)['word']
+
+    generator = CrosswordGenerator(size, size, rng=rng)
+    generator.deadline = deadline
+    puzzle = generator.generate(
+        initial_word=initial_word,
+        word_list=word_list,
+        max_attempts=settings["max_attempts"]
+    )
+    if not puzzle:
+        return None
+
+    body = _puzzle_body(puzzle, size, difficulty)
+    body["stats"]["used_fallback"] = not in_density_bounds(body)
+    return body
+
+def pick_puzzle(best: Optional[Dict], candidate: Optional[Dict]) -> Optional[Dict]:
+    """The denser of two attempt results, for the fallback when no attempt fits its bounds."""
+    if candidate is None:
+        return best
+    if best is None or candidate["stats"]["density"] > best["stats"]["density"]:
+        return candidate
+    return best
+
+def needs_unbudgeted_attempt(puzzle: Optional[Dict], deadline: Optional[float]) -> bool:
+    """Whether a build's budget ran out before any attempt had a puzzle.
+
+    A build never fails only for want of time: it then finishes its first attempt
+    without the budget, which overruns it by one attempt (well under a second).
+    """
+    return puzzle is None and deadline is not None and time.time() >= deadline
+
+def finish_build(puzzle: Optional[Dict], seed: int, deadline: Optional[float] = None) -> Dict:
+    """Check, stamp and log the puzzle a build settled on; raises PuzzleBuildError if there is none.
+
+    `budget_exhausted` says the build hit its `deadline` and settled for the best
+    puzzle it had by then, or for its first attempt finished past the deadline.
+    """
+    budget_exhausted = deadline is not None and time.time() >= deadline
+    if not puzzle:
+        raise PuzzleBuildError("Failed to generate any valid puzzle", "Please try again with different settings.")
+
+    stats = puzzle["stats"]
+    stats["seed"] = seed
+    stats["budget_exhausted"] = budget_exhausted
+    if stats["used_fallback"]:
+        min_density, max_density = DENSITY_BOUNDS[stats["difficulty"]]
+        logger.warning(f"Used fallback puzzle with density={stats['density']:.2%} "
+                      f"(target: {min_density:.2%}-{max_density:.2%})")
+
+    logger.info(f"Generation successful - Word count: {stats['word_count']}, Density: {stats['density']:.2%}")
+    return puzzle
+
+def build_puzzle(size: int, difficulty: str, dict_helper,
+                 on_attempt: Optional[Callable[[int, int], None]] = None, seed: Optional[int] = None,
+                 deadline: Optional[float] = None) -> Dict:
+    """Generate one puzzle of a validated size and difficulty and return the /generate body.
+
+    Runs up to MAX_GENERATION_TRIES attempts one after another, keeping the first
+    whose density suits the difficulty or else the densest. The same `seed` gives
+    the same puzzle unless the absolute `deadline` cuts the build short; without
+    one a fresh seed is drawn and reported in the stats. If the deadline passes
+    before any attempt has a puzzle, the first attempt is finished without it.
+    `on_attempt(attempt, max_attempts)` is called before each attempt; raises
+    PuzzleBuildError if none works.
+    """
+    seed = new_seed() if seed is None else seed
+    initial_length, attempt_seeds = plan_build(size, difficulty, dict_helper, seed)
+    best_puzzle = None
+
+    for attempt in range(MAX_GENERATION_TRIES):
+        if deadline is not None and time.time() >= deadline:
+            break
+        if on_attempt:
+            on_attempt(attempt, MAX_GENERATION_TRIES)
+        puzzle = build_attempt(size, difficulty, attempt, initial_length, dict_helper, attempt_seeds[attempt], deadline)
+        if puzzle is not None and in_density_bounds(puzzle):
+            return finish_build(puzzle, seed, deadline)
+        best_puzzle = pick_puzzle(best_puzzle, puzzle)
+
+    if needs_unbudgeted_attempt(best_puzzle, deadline):
+        best_puzzle = build_attempt(size, difficulty, 0, initial_length, dict_helper, attempt_seeds[0])
+    return finish_build(best_puzzle, seed, deadline)
+
+def _puzzle_body(puzzle: CrosswordGenerator, size: int, difficulty: str) -> Dict:
+    empty_grid = puzzle.empty_grid
+    
+    across, down = puzzle.analyze_grid(for_empty_grid=True)
+    numbered_positions = {(slot.x, slot.y): slot.number for slot in across + down}
+    
+    for y in range(puzzle.height):
+        for x in range(puzzle.width):
+            if (x, y) in numbered_positions:
+                empty_grid[y][x] = str(numbered_positions[(x, y)])
+    
+    return {
+        "success": True,
+        "grid": puzzle.grid,
+        "empty_grid": empty_grid,   
+        "clues": puzzle.get_clues(),
+        "stats": {
+            "word_count": len(puzzle.words),
+            "difficulty": difficulty,
+            "size": size,
+            "density": puzzle.calculate_density()
+        }
+    }
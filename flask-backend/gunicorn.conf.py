@@ -0,0 +1,8 @@
+import os
+
+# One process keeps the dictionary, caches and pools in memory once; its threads serve
+# requests concurrently and server.py sizes its admission gates from the same WEB_THREADS.
+worker_class = "gthread"
+workers = 1
+threads = int(os.environ.get("WEB_THREADS", 16))
+timeout = 30
@@ -0,0 +1,268 @@
+import heapq
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+class JobCancelled(Exception):
+    """Raised inside a handler to abandon a job that has been cancelled."""
+
+
+class MemoryJobStore:
+    """Job records kept in this process; enough for a single server process."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def put(self, job: Dict):
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def purge(self, finished_before: float):
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job["finished_at"] and job["finished_at"] < finished_before]:
+                del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """Job records in a SQLite file, so every server process sees every job.
+
+    A job still runs in the process that accepted it; the others can report its
+    status and record a cancellation, which the owner picks up at its next check.
+    """
+
+    COLUMNS = ("id", "type", "priority", "status", "progress", "result", "error",
+               "cancel_requested", "created_at", "started_at", "finished_at")
+    JSON_COLUMNS = ("progress", "result", "error")
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, type TEXT, priority INTEGER, status TEXT, "
+                "progress TEXT, result TEXT, error TEXT, cancel_requested INTEGER, created_at REAL, "
+                "started_at REAL, finished_at REAL)"
+            )
+
+    def put(self, job: Dict):
+        row = [json.dumps(job[column]) if column in self.JSON_COLUMNS else job[column] for column in self.COLUMNS]
+        with self._lock, self._conn:
+            self._conn.execute(f"INSERT OR REPLACE INTO jobs VALUES ({', '.join('?' * len(self.COLUMNS))})", row)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self.COLUMNS, row))
+        for column in self.JSON_COLUMNS:
+            job[column] = json.loads(job[column])
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def update(self, job_id: str, **fields):
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        values = [json.dumps(value) if column in self.JSON_COLUMNS else value for column, value in fields.items()]
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", values + [job_id])
+
+    def purge(self, finished_before: float):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (finished_before,))
+
+
+class JobContext:
+    """What a handler gets to report progress and to notice cancellation.
+
+    `stop_check` fits a solver's `stop_check` hook and counts search steps as
+    progress. Progress goes to the store and cancellations from other processes
+    are read back at most every SYNC_INTERVAL seconds.
+    """
+
+    SYNC_INTERVAL = 0.5
+
+    def __init__(self, job_queue: "JobQueue", job_id: str):
+        self._queue = job_queue
+        self.job_id = job_id
+        self.progress: Dict = {}
+        self._cancelled = False
+        self._steps = 0
+        self._last_sync = time.time()
+
+    def report(self, **progress):
+        self.progress.update(progress)
+        self._sync()
+
+    def cancelled(self) -> bool:
+        if not self._cancelled and self._queue._is_cancelled(self.job_id):
+            self._cancelled = True
+        if not self._cancelled:
+            self._sync()
+        return self._cancelled
+
+    def stop_check(self) -> bool:
+        self._steps += 1
+        self.progress["search_steps"] = self._steps
+        return self.cancelled()
+
+    def raise_if_cancelled(self):
+        if self.cancelled():
+            raise JobCancelled()
+
+    def _sync(self):
+        if time.time() - self._last_sync < self.SYNC_INTERVAL:
+            return
+        self._last_sync = time.time()
+        self._queue.store.update(self.job_id, progress=dict(self.progress))
+        job = self._queue.store.get(self.job_id)
+        if job and job["cancel_requested"]:
+            self._cancelled = True
+
+
+class JobQueue:
+    """Runs solve and generate jobs on a few background threads, highest priority first.
+
+    `handlers` maps a job type to `handler(payload, context) -> result`. Results
+    are kept in `store` for `result_ttl` seconds after the job finishes. A handler
+    error with a `payload` dict is stored as that error body. At most `max_queued`
+    jobs wait at once; `submit` refuses more with a RuntimeError.
+    """
+
+    def __init__(self, handlers: Dict[str, Callable[[Dict, JobContext], Dict]], store=None,
+                 workers: int = 2, max_queued: int = 100, result_ttl: float = 3600):
+        self.handlers = handlers
+        self.store = store or MemoryJobStore()
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self._heap = []
+        self._order = itertools.count()
+        self._cancelled = set()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._threads = []
+
+    def submit(self, job_type: str, payload: Dict, priority: int = 0) -> Dict:
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        self.store.purge(time.time() - self.result_ttl)
+        job = {
+            "id": uuid.uuid4().hex,
+            "type": job_type,
+            "priority": priority,
+            "status": "queued",
+            "progress": {},
+            "result": None,
+            "error": None,
+            "cancel_requested": False,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None
+        }
+        with self._lock:
+            if len(self._heap) >= self.max_queued:
+                raise RuntimeError("Job queue is full")
+            self.store.put(job)
+            # Higher priority first, then first come first served.
+            heapq.heappush(self._heap, (-priority, next(self._order), job["id"], job_type, payload))
+            self._start_workers()
+            self._ready.notify()
+        logger.info(f"Job {job['id']} queued - Type: {job_type}, Priority: {priority}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued job at once, or ask a running one to stop at its next check."""
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATUSES:
+            return job
+
+        with self._lock:
+            remaining = [entry for entry in self._heap if entry[2] != job_id]
+            queued_here = len(remaining) != len(self._heap)
+            if queued_here:
+                self._heap = remaining
+                heapq.heapify(self._heap)
+            else:
+                self._cancelled.add(job_id)
+        self.store.update(job_id, cancel_requested=True)
+        if queued_here:
+            self._finish(job_id, "cancelled")
+        logger.info(f"Job {job_id} cancellation requested")
+        return self.store.get(job_id)
+
+    def queued(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+    def _is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancelled
+
+    def _start_workers(self):
+        # Threads start with the first job, so a server process that forks workers has none to lose.
+        if not self._threads:
+            for rank in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"job-worker-{rank}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            with self._ready:
+                while not self._heap:
+                    self._ready.wait()
+                _, _, job_id, job_type, payload = heapq.heappop(self._heap)
+
+            job = self.store.get(job_id)
+            if job is None or job["status"] != "queued":
+                continue
+            if job["cancel_requested"]:
+                self._finish(job_id, "cancelled")
+                continue
+
+            self.store.update(job_id, status="running", started_at=time.time())
+            context = JobContext(self, job_id)
+            try:
+                result = self.handlers[job_type](payload, context)
+            except JobCancelled:
+                self._finish(job_id, "cancelled", progress=dict(context.progress))
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+                error = getattr(e, "payload", None) or {"error": "Job failed", "details": str(e)}
+                self._finish(job_id, "failed", progress=dict(context.progress), error=error)
+            else:
+                # A solver that was stopped still returns its partial fill; keep it with the cancellation.
+                status = "cancelled" if context.cancelled() else "succeeded"
+                self._finish(job_id, status, progress=dict(context.progress), result=result)
+
+    def _finish(self, job_id: str, status: str, **fields):
+        with self._lock:
+            self._cancelled.discard(job_id)
+        self.store.update(job_id, status=status, finished_at=time.time(), **fields)
+        logger.info(f"Job {job_id} {status}")
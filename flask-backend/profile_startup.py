@@ -0,0 +1,84 @@
+"""Show where a server process spends its boot time.
+
+Run from flask-backend:
+
+    python profile_startup.py --top 15
+
+Imports `server` in a fresh interpreter under `python -X importtime` and prints
+the modules `server` imports directly by total import time, the slowest
+individual modules, and the time spent building the dictionary. The solver and
+puzzle pools are not started, so only the import and setup work a gunicorn
+worker or a Render cold start always pays is counted.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+PROBE = (
+    "import json, time\n"
+    "started = time.perf_counter()\n"
+    "import server\n"
+    "print(json.dumps({'import_seconds': time.perf_counter() - started,\n"
+    "                  'dictionary_seconds': server.dict_helper.load_seconds}))\n"
+)
+
+def profile_startup() -> Dict:
+    """Import the server once in a child interpreter and return its import tree and timings."""
+    env = {**os.environ, "SOLVER_POOL_PREWARM": "0", "RENDER": "1"}
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE], env=env,
+                               capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing server failed:\n{completed.stderr[-2000:]}")
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({"module": name, "depth": len(indent) // 2,
+                            "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {"modules": modules, **timings}
+
+def direct_imports(modules: List[Dict]) -> List[Dict]:
+    # importtime prints children before their parent, so the entries one level
+    # deeper than `server` that precede it are its direct imports.
+    server_index = next(i for i, row in enumerate(modules) if row["module"] == "server")
+    direct = []
+    for row in reversed(modules[:server_index]):
+        if row["depth"] == modules[server_index]["depth"]:
+            break
+        if row["depth"] == modules[server_index]["depth"] + 1:
+            direct.append(row)
+    return sorted(direct, key=lambda row: row["cumulative_ms"], reverse=True)
+
+def print_report(profile: Dict, top: int):
+    modules = profile["modules"]
+    print(f"server import: {profile['import_seconds']:.3f}s, dictionary build: {profile['dictionary_seconds']:.3f}s")
+    print(f"\n{'imported by server':<40} {'total ms':>10}")
+    for row in direct_imports(modules)[:top]:
+        print(f"{row['module']:<40} {row['cumulative_ms']:>10.1f}")
+    print(f"\n{'slowest modules (own time)':<40} {'self ms':>10} {'total ms':>10}")
+    for row in sorted(modules, key=lambda row: row["self_ms"], reverse=True)[:top]:
+        print(f"{row['module']:<40} {row['self_ms']:>10.1f} {row['cumulative_ms']:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="also write the profile to this file")
+    args = parser.parse_args()
+
+    profile = profile_startup()
+    print_report(profile, args.top)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(profile, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Bucket = Tuple[int, str]
+
+class PuzzlePool:
+    """Ready-made puzzles per (size, difficulty) bucket, topped up in the background.
+
+    `build(size, difficulty)` starts one puzzle build and returns a future for its
+    /generate body. When a bucket is down to `low_water` ready or building
+    puzzles it is refilled to `depth`; the default, depth - 1, replaces every
+    puzzle as soon as it is taken, so a bucket only runs dry under a burst. At most
+    `max_builds` builds run at once across all buckets, which caps how much of the
+    workers the pool takes from solves. Buckets named in `buckets` are filled by
+    `start`; any other bucket joins the pool the first time it is asked for.
+    """
+
+    def __init__(self, build: Callable[[int, str], Future], buckets: Iterable[Bucket] = (),
+                 depth: int = 3, low_water: Optional[int] = None, max_builds: int = 1):
+        self.build = build
+        self.depth = max(0, depth)
+        self.low_water = max(0, min(self.depth - 1 if low_water is None else low_water, self.depth - 1))
+        self.max_builds = max(1, max_builds)
+        self._buckets = {bucket: self._new_bucket() for bucket in buckets}
+        self._building = 0
+        # Re-entrant: a build that is already done runs its callback straight from _pump.
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _new_bucket() -> Dict:
+        return {"ready": collections.deque(), "building": 0, "refilling": False,
+                "served": 0, "misses": 0, "built": 0, "failed": 0, "build_seconds": 0.0}
+
+    def start(self):
+        """Fill every configured bucket."""
+        with self._lock:
+            for bucket in self._buckets.values():
+                bucket["refilling"] = self.depth > 0
+            self._pump()
+
+    def take(self, size: int, difficulty: str) -> Optional[Dict]:
+        """Pop a ready puzzle, or None if the bucket is empty; either way the bucket is topped up if low."""
+        if self.depth == 0:
+            return None
+        with self._lock:
+            bucket = self._buckets.setdefault((size, difficulty), self._new_bucket())
+            puzzle = bucket["ready"].popleft() if bucket["ready"] else None
+            if puzzle is None:
+                bucket["misses"] += 1
+            else:
+                bucket["served"] += 1
+            if len(bucket["ready"]) + bucket["building"] <= self.low_water:
+                bucket["refilling"] = True
+            self._pump()
+        return puzzle
+
+    def _pump(self):
+        # Called with the lock held: hand free build slots to refilling buckets, emptiest first.
+        while self._building < self.max_builds:
+            pending = [(key, bucket) for key, bucket in self._buckets.items()
+                       if bucket["refilling"] and len(bucket["ready"]) + bucket["building"] < self.depth]
+            if not pending:
+                return
+            key, bucket = min(pending, key=lambda entry: len(entry[1]["ready"]) + entry[1]["building"])
+            try:
+                future = self.build(*key)
+            except Exception as e:
+                logger.error(f"Puzzle pool could not start a build for {key}: {str(e)}")
+                bucket["refilling"] = False
+                return
+            bucket["building"] += 1
+            self._building += 1
+            future.add_done_callback(lambda done, key=key, started=time.time(): self._on_built(key, done, started))
+
+    def _on_built(self, key: Bucket, future: Future, started: float):
+        with self._lock:
+            bucket = self._buckets[key]
+            bucket["building"] -= 1
+            self._building -= 1
+            if future.cancelled() or future.exception() is not None:
+                bucket["failed"] += 1
+                logger.warning(f"Puzzle pool build for {key} failed: {future.exception() if not future.cancelled() else 'cancelled'}")
+                # Wait for the next request before trying again, rather than retrying a broken build in a loop.
+                bucket["refilling"] = False
+            else:
+                bucket["ready"].append(future.result())
+                bucket["built"] += 1
+                bucket["build_seconds"] += time.time() - started
+            if len(bucket["ready"]) >= self.depth:
+                bucket["refilling"] = False
+            self._pump()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "depth": self.depth,
+                "low_water": self.low_water,
+                "max_builds": self.max_builds,
+                "building": self._building,
+                "buckets": {
+                    f"{size}:{difficulty}": {
+                        "ready": len(bucket["ready"]),
+                        "building": bucket["building"],
+                        "served": bucket["served"],
+                        "misses": bucket["misses"],
+                        "built": bucket["built"],
+                        "failed": bucket["failed"],
+                        "avg_build_seconds": round(bucket["build_seconds"] / bucket["built"], 3) if bucket["built"] else None
+                    }
+                    for (size, difficulty), bucket in sorted(self._buckets.items())
+                }
+            }
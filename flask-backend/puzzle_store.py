@@ -0,0 +1,152 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from solution_cache import puzzle_fingerprint
+from solver.core.decomposition import split_puzzle
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StoredPuzzle:
+    """A generated puzzle plus the state every solve of it can share.
+
+    `solve_grid` is the blank grid solvers start from and `clue_sets` the clues
+    split into independent slot regions.
+    """
+    puzzle_id: str
+    puzzle: Dict
+    solve_grid: List[List[str]]
+    clue_sets: List[Dict[str, List[Dict]]]
+    fingerprint: str
+
+    @classmethod
+    def build(cls, puzzle_id: str, puzzle: Dict) -> "StoredPuzzle":
+        solve_grid = [['.' for _ in row] for row in puzzle["grid"]]
+        return cls(
+            puzzle_id=puzzle_id,
+            puzzle=puzzle,
+            solve_grid=solve_grid,
+            clue_sets=split_puzzle(solve_grid, puzzle["clues"]),
+            fingerprint=puzzle_fingerprint(solve_grid, puzzle["clues"])
+        )
+
+
+class PuzzleStore:
+    """Generated puzzles by id, so later requests can send a `puzzle_id` instead of the puzzle.
+
+    Up to `max_entries` puzzles stay in this process, least recently used first
+    out. With a SQLite `path` every puzzle and render is also written to disk, so
+    an evicted puzzle, or one generated by another server process, is loaded back
+    on first use. Without one, an evicted puzzle is gone.
+
+    PNG/PDF renders share one in-memory LRU of at most `max_render_bytes` across
+    all puzzles; with a database an evicted render is read back from disk rather
+    than drawn again.
+    """
+
+    def __init__(self, max_entries: int = 500, path: Optional[str] = None, max_render_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max(1, max_entries)
+        self.max_render_bytes = max(0, max_render_bytes)
+        self._entries: "OrderedDict[str, StoredPuzzle]" = OrderedDict()
+        self._renders: "OrderedDict[Tuple[str, str, bool], bytes]" = OrderedDict()
+        self._render_bytes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("CREATE TABLE IF NOT EXISTS puzzles (id TEXT PRIMARY KEY, puzzle TEXT, created_at REAL)")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS renders (id TEXT, format TEXT, show_answers INTEGER, data BLOB, "
+                    "PRIMARY KEY (id, format, show_answers))"
+                )
+
+    def add(self, puzzle: Dict) -> str:
+        """Store a /generate response body and return its new puzzle id."""
+        stored = StoredPuzzle.build(uuid.uuid4().hex, puzzle)
+        if self._conn is not None:
+            with self._lock, self._conn:
+                self._conn.execute("INSERT INTO puzzles VALUES (?, ?, ?)",
+                                   (stored.puzzle_id, json.dumps(puzzle), time.time()))
+        self._remember(stored)
+        return stored.puzzle_id
+
+    def get(self, puzzle_id: str) -> Optional[StoredPuzzle]:
+        with self._lock:
+            stored = self._entries.get(puzzle_id)
+            if stored is not None:
+                self._entries.move_to_end(puzzle_id)
+                return stored
+        if self._conn is None:
+            return None
+
+        with self._lock:
+            row = self._conn.execute("SELECT puzzle FROM puzzles WHERE id = ?", (puzzle_id,)).fetchone()
+        if row is None:
+            return None
+        stored = StoredPuzzle.build(puzzle_id, json.loads(row[0]))
+        self._remember(stored)
+        return stored
+
+    def render(self, stored: StoredPuzzle, format: str, show_answers: bool,
+               renderer: Callable[[Dict, bool], bytes]) -> bytes:
+        """The puzzle drawn by `renderer(puzzle, show_answers)`, drawn at most once per format while remembered."""
+        key = (stored.puzzle_id, format, show_answers)
+        with self._lock:
+            data = self._renders.get(key)
+            if data is not None:
+                self._renders.move_to_end(key)
+                return data
+
+        if self._conn is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data FROM renders WHERE id = ? AND format = ? AND show_answers = ?",
+                    (stored.puzzle_id, format, int(show_answers))
+                ).fetchone()
+            if row is not None:
+                data = bytes(row[0])
+                self._remember_render(key, data)
+                return data
+
+        data = renderer(stored.puzzle, show_answers)
+        if self._conn is not None:
+            with self._lock, self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO renders VALUES (?, ?, ?, ?)",
+                                   (stored.puzzle_id, format, int(show_answers), data))
+        self._remember_render(key, data)
+        return data
+
+    def _remember_render(self, key: Tuple[str, str, bool], data: bytes):
+        if len(data) > self.max_render_bytes:
+            return
+        with self._lock:
+            previous = self._renders.pop(key, None)
+            if previous is not None:
+                self._render_bytes -= len(previous)
+            self._renders[key] = data
+            self._render_bytes += len(data)
+            while self._render_bytes > self.max_render_bytes:
+                _, evicted = self._renders.popitem(last=False)
+                self._render_bytes -= len(evicted)
+
+    def _remember(self, stored: StoredPuzzle):
+        with self._lock:
+            self._entries[stored.puzzle_id] = stored
+            self._entries.move_to_end(stored.puzzle_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries,
+                    "renders": len(self._renders), "render_bytes": self._render_bytes,
+                    "max_render_bytes": self.max_render_bytes}
@@ -1,18 +1,29 @@
+import functools
+import hashlib
+import json
 import logging
-import random
+import multiprocessing
 import time
 import traceback
 import os
-from flask import Flask, make_response, request, jsonify
+import queue
+import threading
+from flask import Flask, Response, make_response, request, jsonify
 from flask_cors import CORS
-from dictionary_helper import DictionaryHelper
-from generate_downloadables import generate_png_image, generate_pdf
-from generator.crossword_generator import CrosswordGenerator
-
-from solver.algorithms.astar_solver import AStarSolver
-from solver.algorithms.dfs_solver import DFSSolver
-from solver.algorithms.hybrid_solver import HybridSolver
-from solver.analysis.visualizer import ComplexityVisualizer
+import psutil
+from admission import AdmissionGate
+from dictionary_helper import shared_dictionary
+from generator.puzzle_builder import PuzzleBuildError
+from job_queue import JobQueue, MemoryJobStore, SQLiteJobStore
+from puzzle_pool import PuzzlePool
+from puzzle_store import PuzzleStore
+from single_flight import SingleFlight
+from solution_cache import SolutionCache, puzzle_fingerprint
+from wire_format import compress, decode_grid, encode_grid, parse_encoding
+from worker_pool import SolverPool, run_isolated
+
+from solver.algorithms.factory import SOLVER_CLASSES, create_solver
+from solver.core.decomposition import split_puzzle
 
 logging.basicConfig(
     level=logging.INFO if os.environ.get('RENDER') else logging.DEBUG,
@@ -35,14 +46,90 @@ else:
     logger.info("CORS configured for development (allowing all origins)")
 
 try:
-    dict_helper = DictionaryHelper("dictionary")
-    logger.info("Dictionary helper initialized successfully")
+    dict_helper = shared_dictionary("dictionary")
+    logger.info(f"Dictionary helper initialized successfully in {dict_helper.load_seconds:.2f}s")
 except Exception as e:
     logger.error(f"Failed to initialize dictionary helper: {str(e)}")
     raise
 
 complexity_trackers = {}
 
+MAX_HDA_WORKERS = os.cpu_count() or 1
+ANALYZE_TIME_LIMIT_MS = int(os.environ.get('ANALYZE_TIME_LIMIT_MS', 30000))
+ANALYZE_MEMORY_LIMIT_MB = int(os.environ.get('ANALYZE_MEMORY_LIMIT_MB', 512))
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 1000))
+BATCH_TIME_LIMIT_MS = int(os.environ.get('BATCH_TIME_LIMIT_MS', 30000))
+MAX_JOB_PRIORITY = 9
+# Just under gunicorn's default 30s worker timeout, so a slow solve answers with its partial fill instead of being killed.
+SOLVE_TIME_LIMIT_MS = int(os.environ.get('SOLVE_TIME_LIMIT_MS', 25000))
+JOB_TIME_LIMIT_MS = int(os.environ.get('JOB_TIME_LIMIT_MS', 300000))
+GENERATE_TIME_BUDGET_MS = int(os.environ.get('GENERATE_TIME_BUDGET_MS', 25000))
+SSE_KEEPALIVE_SECONDS = 15
+MAX_GRID_SIZE = int(os.environ.get('MAX_GRID_SIZE', 25))
+MAX_CLUES = int(os.environ.get('MAX_CLUES', 300))
+MAX_CLUE_LENGTH = int(os.environ.get('MAX_CLUE_LENGTH', 500))
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_REQUEST_BYTES', 2 * 1024 * 1024))
+
+# Request threads per server process (gunicorn.conf.py). A queued request holds a thread
+# while it waits, so the gates below hand out running and waiting slots from this budget.
+SERVER_THREADS = int(os.environ.get('WEB_THREADS', 16))
+
+# Concurrent requests per endpoint group and how many more may queue for a slot, for 16
+# threads and scaled to SERVER_THREADS; each is overridable as ADMISSION_<GROUP>_LIMIT /
+# ADMISSION_<GROUP>_QUEUE. "light" covers the cheap endpoints, so they keep their own slots
+# however busy the solvers are, and one thread is left for /health and /jobs.
+ADMISSION_DEFAULTS = {
+    "solve": (3, 2),
+    "analyze": (1, 1),
+    "generate": (1, 1),
+    "download": (1, 1),
+    "light": (3, 1)
+}
+ADMISSION_WAIT_SECONDS = float(os.environ.get('ADMISSION_WAIT_SECONDS', 5))
+admission_gates = {
+    name: AdmissionGate(
+        name,
+        limit=int(os.environ.get(f'ADMISSION_{name.upper()}_LIMIT', max(1, limit * SERVER_THREADS // 16))),
+        max_waiting=int(os.environ.get(f'ADMISSION_{name.upper()}_QUEUE', max_waiting * SERVER_THREADS // 16)),
+        wait_timeout=ADMISSION_WAIT_SECONDS
+    )
+    for name, (limit, max_waiting) in ADMISSION_DEFAULTS.items()
+}
+if sum(gate.limit + gate.max_waiting for gate in admission_gates.values()) >= SERVER_THREADS:
+    logger.warning(f"Admission gates hand out more slots than the {SERVER_THREADS} request threads; "
+                   "requests beyond the threads queue in the server instead of getting a 429")
+# Request fields that do not change what a solve returns once it has succeeded.
+UNCACHED_SOLVE_FIELDS = ("grid", "clues", "puzzle_id", "algorithm", "time_limit_ms", "encoding")
+
+solution_cache = SolutionCache(
+    max_entries=int(os.environ.get('SOLUTION_CACHE_SIZE', 256)),
+    ttl=int(os.environ.get('SOLUTION_CACHE_TTL', 3600))
+)
+solve_flights = SingleFlight()
+download_flights = SingleFlight()
+puzzle_store = PuzzleStore(
+    max_entries=int(os.environ.get('PUZZLE_STORE_SIZE', 500)),
+    path=os.environ.get('PUZZLE_DB_PATH'),
+    max_render_bytes=int(os.environ.get('PUZZLE_RENDER_CACHE_BYTES', 8 * 1024 * 1024))
+)
+
+solver_pool = SolverPool(dict_helper, workers=int(os.environ.get('SOLVER_POOL_WORKERS', 3)))
+# Buckets filled at startup, as "size:difficulty" pairs. None by default: boot-time builds would compete
+# with the first real requests for the CPU, so a bucket is pooled once it is first asked for.
+puzzle_pool = PuzzlePool(
+    solver_pool.generate,
+    buckets=[(int(size), difficulty) for size, difficulty in
+             (bucket.split(':') for bucket in os.environ.get('PUZZLE_POOL_BUCKETS', '').split(',') if bucket)],
+    depth=int(os.environ.get('PUZZLE_POOL_DEPTH', 3)),
+    low_water=int(os.environ['PUZZLE_POOL_LOW_WATER']) if os.environ.get('PUZZLE_POOL_LOW_WATER') else None,
+    max_builds=int(os.environ.get('PUZZLE_POOL_MAX_BUILDS', 1))
+)
+if os.environ.get('SOLVER_POOL_PREWARM', '1') == '1' and multiprocessing.parent_process() is None:
+    solver_pool.start()
+    puzzle_pool.start()
+
 def _build_cors_preflight_response():
     """Build CORS preflight response"""
     response = jsonify({"message": "Preflight Request Accepted"})
@@ -65,6 +152,27 @@ def log_request_info():
     else:
         logger.info(f"Request: {request.method} {request.path} - Headers: {dict(request.headers)}")
 
+@app.before_request
+def reject_large_bodies():
+    """Turn away an oversized body from its Content-Length, before anything reads it"""
+    if request.content_length is not None and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+        return request_too_large(None)
+
+@app.after_request
+def compress_response(response):
+    """Gzip or deflate a large JSON body when the client accepts it"""
+    if (response.is_streamed or response.direct_passthrough or response.mimetype != "application/json"
+            or "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+    coding = request.accept_encodings.best_match(["gzip", "deflate"])
+    data = response.get_data()
+    if coding is None or len(data) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress(data, coding, COMPRESS_LEVEL))
+    response.headers["Content-Encoding"] = coding
+    return response
+
 @app.after_request
 def log_response_info(response):
     """Log response details for debugging"""
@@ -79,7 +187,13 @@ def health_check():
         "status": "healthy",
         "service": "crossword-backend",
         "timestamp": time.time(),
-        "environment": "production" if os.environ.get('RENDER') else "development"
+        "environment": "production" if os.environ.get('RENDER') else "development",
+        "solution_cache": solution_cache.stats(),
+        "coalescing": {"solve": solve_flights.stats(), "download": download_flights.stats()},
+        "puzzle_store": puzzle_store.stats(),
+        "puzzle_pool": puzzle_pool.stats(),
+        "admission": {name: gate.stats() for name, gate in admission_gates.items()},
+        "startup": startup_timings
     })
 
 @app.route("/", methods=["GET"])
@@ -92,46 +206,243 @@ def home():
             "/health - Health check",
             "/generate - Generate crossword puzzle",
             "/solve - Solve crossword puzzle",
+            "/solve/stream - Solve crossword puzzle, streaming progress as server-sent events",
+            "/solve/batch - Solve many puzzles, streaming NDJSON results",
+            "/jobs - Queue a solve or generate job; poll or cancel it at /jobs/<id>",
+            "/puzzles/<id> - Fetch a generated puzzle by the puzzle_id /generate returned",
             "/analyze - Compare algorithms",
             "/suggest - Get word suggestions",
             "/download - Download puzzle"
         ]
     })
 
-@app.route("/solve", methods=["POST", "OPTIONS"])
-def solve():
-    if request.method == "OPTIONS":
-        return _build_cors_preflight_response()
-
+HYBRID_OPTION_TYPES = {
+    "beam_width": int,
+    "min_beam_width": int,
+    "max_beam_width": int,
+    "beam_diversity": int,
+    "max_expansions": int,
+    "switch_threshold": float,
+    "beam_time_budget_ms": float,
+    "adaptive": bool
+}
+
+def _parse_hybrid_options(options):
+    """Validate the optional per-request HybridSolver overrides; raises ValueError on bad input."""
+    if options is None:
+        return {}
+    if not isinstance(options, dict):
+        raise ValueError("hybrid must be an object")
+
+    parsed = {}
+    for name, value in options.items():
+        expected = HYBRID_OPTION_TYPES.get(name)
+        if expected is None:
+            raise ValueError(f"Unknown hybrid option: {name}")
+        if expected is bool:
+            if not isinstance(value, bool):
+                raise ValueError(f"hybrid.{name} must be a boolean")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"hybrid.{name} must be a non-negative number")
+        elif expected is int and value != int(value):
+            raise ValueError(f"hybrid.{name} must be an integer")
+        parsed[name] = expected(value)
+
+    if "switch_threshold" in parsed and parsed["switch_threshold"] > 1:
+        raise ValueError("hybrid.switch_threshold must be between 0 and 1")
+    if "beam_time_budget_ms" in parsed:
+        parsed["beam_time_budget"] = parsed.pop("beam_time_budget_ms") / 1000
+    return parsed
+
+class PuzzleRequestError(ValueError):
+    """Bad input for a solve or generate request; `payload` is the JSON error body and `status` its HTTP status."""
+
+    def __init__(self, error, status=400, **fields):
+        super().__init__(error)
+        self.status = status
+        self.payload = {"error": error, **fields}
+
+def _admitted(group):
+    """Run the view only once the `group` admission gate lets it in, else answer 429.
+
+    The slot is freed when the view returns, except for a streamed response,
+    which keeps it until the body has been sent and the response closed.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method == "OPTIONS":
+                return view(*args, **kwargs)
+            gate = admission_gates[group]
+            admitted_at = gate.acquire()
+            if admitted_at is None:
+                logger.warning(f"Admission refused - Group: {group}, Path: {request.path}")
+                response = _corsify_actual_response(jsonify({
+                    "error": "Server busy",
+                    "message": "Too many requests of this kind are running; retry after the given delay."
+                }), 429)
+                response.headers["Retry-After"] = str(gate.retry_after())
+                return response
+            try:
+                response = app.make_response(view(*args, **kwargs))
+            except BaseException:
+                gate.release(admitted_at)
+                raise
+            if response.is_streamed:
+                response.call_on_close(lambda: gate.release(admitted_at))
+            else:
+                gate.release(admitted_at)
+            return response
+        return wrapper
+    return decorator
+
+def _check_puzzle_size(grid, clues):
+    """Reject a grid and clues that are malformed or beyond the configured caps, before any solver sees them."""
+    if not isinstance(grid, list) or not all(isinstance(row, list) and row for row in grid):
+        raise PuzzleRequestError("grid must be a list of non-empty rows")
+    height, width = len(grid), len(grid[0])
+    if height > MAX_GRID_SIZE or width > MAX_GRID_SIZE:
+        raise PuzzleRequestError(f"grid may be at most {MAX_GRID_SIZE}x{MAX_GRID_SIZE}", status=413)
+    if any(len(row) != width for row in grid):
+        raise PuzzleRequestError("grid rows must all be the same length")
+    if not isinstance(clues, dict) or not all(isinstance(clues.get(direction, []), list) for direction in ("across", "down")):
+        raise PuzzleRequestError("clues must hold across and down lists")
+    if len(clues.get("across", [])) + len(clues.get("down", [])) > MAX_CLUES:
+        raise PuzzleRequestError(f"At most {MAX_CLUES} clues per puzzle", status=413)
+    for direction in ("across", "down"):
+        for clue in clues.get(direction, []):
+            if not isinstance(clue, dict) or not all(
+                    isinstance(clue.get(field), int) and not isinstance(clue.get(field), bool) for field in ("x", "y", "length")):
+                raise PuzzleRequestError("Each clue needs integer x, y and length")
+            end_x = clue["x"] + (clue["length"] - 1 if direction == "across" else 0)
+            end_y = clue["y"] + (clue["length"] - 1 if direction == "down" else 0)
+            if clue["length"] < 1 or min(clue["x"], clue["y"]) < 0 or end_x >= width or end_y >= height:
+                raise PuzzleRequestError(f"{direction} clue {clue.get('number')} does not fit in the grid")
+            if len(str(clue.get("clue", ""))) > MAX_CLUE_LENGTH:
+                raise PuzzleRequestError(f"Clue text may be at most {MAX_CLUE_LENGTH} characters", status=413)
+
+def _grid_encoding(data):
+    """The grid encoding a request body asks its response to use (see wire_format)."""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No data received"}), 400
+        return parse_encoding(data.get("encoding", "cells"))
+    except ValueError as e:
+        raise PuzzleRequestError(str(e))
 
-        grid = data.get("grid")
-        clues = data.get("clues")
-        algorithm = data.get("algorithm", "HYBRID").upper()
-        enable_memory_profiling = data.get("enable_memory_profiling", False)
-
-        logger.info(f"Solve request - Algorithm: {algorithm}, Grid size: {len(grid)}x{len(grid[0]) if grid else 0}")
-
-        if not grid or not clues:
-            return jsonify({"error": "Missing grid or clues"}), 400
-
-        start_time = time.time()
+def _request_grid(data):
+    """The body's grid as lists of cells, whichever encoding it was sent in."""
+    try:
+        return decode_grid(data.get("grid"), MAX_GRID_SIZE)
+    except ValueError as e:
+        raise PuzzleRequestError(str(e))
+
+def _stored_puzzle(data):
+    """The stored puzzle a request body names by `puzzle_id`, or None if it sends the puzzle itself."""
+    puzzle_id = data.get("puzzle_id")
+    if puzzle_id is None:
+        return None
+    stored = puzzle_store.get(puzzle_id) if isinstance(puzzle_id, str) else None
+    if stored is None:
+        raise PuzzleRequestError("Unknown puzzle_id", message="The puzzle has expired; send the grid and clues instead.")
+    return stored
+
+def _solve_puzzle(data, stop_check=None, progress_callback=None, max_time_limit_ms=SOLVE_TIME_LIMIT_MS):
+    """Run one /solve request body and return the response data.
+
+    The body either carries the grid and clues or names a generated puzzle by
+    `puzzle_id`, whose slot regions and fingerprint are then already worked out.
+    The grid may come in any wire encoding and the solution goes back in the
+    body's `encoding`.
+    The solve stops at the body's `time_limit_ms`, which defaults to and may not
+    exceed `max_time_limit_ms`, and returns its best partial fill with status
+    "timeout". `stop_check` is handed to every solver, in this process or on the
+    pool, so a background job or a stream can stop them, and `progress_callback`
+    gets their progress snapshots, relayed from the workers for pool runs; raises
+    PuzzleRequestError on bad input.
+    """
+    stored = _stored_puzzle(data)
+    encoding = _grid_encoding(data)
+    grid = stored.solve_grid if stored else _request_grid(data)
+    clues = stored.puzzle["clues"] if stored else data.get("clues")
+    algorithm = data.get("algorithm", "HYBRID").upper()
+    enable_memory_profiling = data.get("enable_memory_profiling", False)
+
+    logger.info(f"Solve request - Algorithm: {algorithm}, Grid size: {len(grid)}x{len(grid[0]) if grid else 0}")
+
+    if not grid or not clues:
+        raise PuzzleRequestError("Missing grid or clues")
+    if not stored:
+        _check_puzzle_size(grid, clues)
 
-        if algorithm == "DFS":
-            solver = DFSSolver(grid, clues, dict_helper, enable_memory_profiling)
-        elif algorithm == "A*":
-            solver = AStarSolver(grid, clues, dict_helper, enable_memory_profiling)
-        elif algorithm == "HYBRID":
-            solver = HybridSolver(grid, clues, dict_helper, enable_memory_profiling)
+    try:
+        hybrid_options = _parse_hybrid_options(data.get("hybrid"))
+    except ValueError as e:
+        raise PuzzleRequestError(str(e))
+
+    start_time = time.time()
+
+    workers = data.get("workers")
+    if workers is not None and (isinstance(workers, bool) or not isinstance(workers, int) or not 1 <= workers <= MAX_HDA_WORKERS):
+        raise PuzzleRequestError(f"workers must be an integer between 1 and {MAX_HDA_WORKERS}")
+
+    decompose = data.get("decompose", True)
+    if not isinstance(decompose, bool):
+        raise PuzzleRequestError("decompose must be a boolean")
+
+    split_depth = data.get("split_depth")
+    if split_depth is not None and (isinstance(split_depth, bool) or not isinstance(split_depth, int) or split_depth < 1):
+        raise PuzzleRequestError("split_depth must be a positive integer")
+
+    time_limit_ms = data.get("time_limit_ms", max_time_limit_ms)
+    if isinstance(time_limit_ms, bool) or not isinstance(time_limit_ms, (int, float)) or not 0 < time_limit_ms <= max_time_limit_ms:
+        raise PuzzleRequestError(f"time_limit_ms must be in (0, {max_time_limit_ms}]")
+    time_limit = time_limit_ms / 1000
+
+    fingerprint = stored.fingerprint if stored else puzzle_fingerprint(grid, clues)
+    options = {key: value for key, value in data.items() if key not in UNCACHED_SOLVE_FIELDS}
+    cache_key = (fingerprint, algorithm, json.dumps(options, sort_keys=True, default=str))
+    cached = solution_cache.get(cache_key)
+    if cached is not None:
+        response_data, tracker = cached
+        if tracker is not None:
+            complexity_trackers[algorithm] = tracker
+        logger.info(f"Solve served from cache - Algorithm: {algorithm}, Fingerprint: {fingerprint[:12]}")
+        return {**response_data, "solution": encode_grid(response_data["solution"], encoding),
+                "cached": True, "coalesced": False}
+
+    def run():
+        portfolio = None
+        tracker = None
+        if algorithm == "PORTFOLIO":
+            portfolio = solver_pool.run_portfolio(grid, clues, enable_memory_profiling, hybrid_options, time_limit,
+                                                  stop_check, progress_callback)
+            result = portfolio["result"]
+        elif algorithm == "PARALLEL_DFS":
+            result = solver_pool.run_parallel_dfs(grid, clues, split_depth, time_limit, stop_check, progress_callback)
+        elif algorithm == "HDA*":
+            from solver.algorithms.hda_star_solver import HDAStarSolver
+            solver = HDAStarSolver(grid, clues, dict_helper, enable_memory_profiling, workers=workers)
+            complexity_trackers[algorithm] = tracker = solver.complexity_tracker
+            solver.stop_check = stop_check
+            solver.set_time_limit(time_limit)
+            result = solver.solve()
+        elif algorithm in SOLVER_CLASSES:
+            if not decompose:
+                clue_sets = [clues]
+            else:
+                clue_sets = stored.clue_sets if stored else split_puzzle(grid, clues)
+            if len(clue_sets) > 1:
+                result = solver_pool.run_components(algorithm, grid, clue_sets, enable_memory_profiling, hybrid_options,
+                                                    time_limit, stop_check, progress_callback)
+            else:
+                solver = create_solver(algorithm, grid, clues, dict_helper, enable_memory_profiling, hybrid_options)
+                complexity_trackers[algorithm] = tracker = solver.complexity_tracker
+                solver.stop_check = stop_check
+                solver.progress_callback = progress_callback
+                solver.set_time_limit(time_limit)
+                result = solver.solve()
         else:
-            return jsonify({"error": "Invalid algorithm"}), 400
+            raise PuzzleRequestError("Invalid algorithm")
 
-        complexity_trackers[algorithm] = solver.complexity_tracker
-        
-        result = solver.solve()
         execution_time = time.time() - start_time
 
         memory_metrics = {
@@ -149,19 +460,64 @@ def solve():
                 "execution_time": f"{execution_time:.4f}s",
                 **memory_metrics,
                 "words_placed": f"{result.get('words_placed', 0)}/{result.get('total_words', 0)}",
+                "quality": result.get("quality"),
                 "time_complexity": result.get("time_complexity", {}),
                 "space_complexity": result.get("space_complexity", {}),
                 "fallback_usage_count": result.get("fallback_usage_count", 0),
+                "candidate_cache": result.get("candidate_cache", {}),
+                "beam_stats": result.get("beam_stats", {}),
             },
             "details": {
                 "status": result.get("status", "unknown"),
-                "algorithm": algorithm
+                "algorithm": algorithm,
+                "stop_reason": result.get("stop_reason"),
+                "time_limit_ms": time_limit_ms,
+                "fingerprint": fingerprint,
+                "phase_report": result.get("phase_report")
             }
         }
+        if "components" in result:
+            response_data["details"]["components"] = result["components"]
+        if "hda_stats" in result:
+            response_data["details"]["hda_stats"] = result["hda_stats"]
+        if "parallel" in result:
+            response_data["details"]["parallel"] = result["parallel"]
+        if portfolio:
+            response_data["details"]["portfolio"] = {
+                "winner": portfolio["winner"],
+                "engines": portfolio["engines"]
+            }
 
         logger.info(f"Solve completed - Algorithm: {algorithm}, Success: {response_data['success']}, Time: {execution_time:.4f}s")
-        return _corsify_actual_response(jsonify(response_data))
+        # Only a complete fill is kept: a partial one may just have run out of time.
+        if response_data["success"]:
+            solution_cache.put(cache_key, (response_data, tracker))
+        return response_data
+
+    if stop_check is None and progress_callback is None:
+        # Overlapping plain requests for the same puzzle, options and limit share one solve;
+        # a stream or job keeps its own, since it can be stopped on its own.
+        response_data, coalesced = solve_flights.do(cache_key + (time_limit_ms,), run)
+    else:
+        response_data, coalesced = run(), False
+    return {**response_data, "solution": encode_grid(response_data["solution"], encoding),
+            "cached": False, "coalesced": coalesced}
+
+@app.route("/solve", methods=["POST", "OPTIONS"])
+@_admitted("solve")
+def solve():
+    if request.method == "OPTIONS":
+        return _build_cors_preflight_response()
 
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data received"}), 400
+
+        return _corsify_actual_response(jsonify(_solve_puzzle(data)))
+
+    except PuzzleRequestError as e:
+        return jsonify(e.payload), e.status
     except Exception as e:
         logger.error(f"Solve error: {str(e)}", exc_info=True)
         return _corsify_actual_response(jsonify({
@@ -169,7 +525,167 @@ def solve():
             "details": str(e)
         }), 500)
 
+@app.route("/solve/stream", methods=["GET", "POST", "OPTIONS"])
+@_admitted("solve")
+def solve_stream():
+    """Solve one puzzle and stream its progress as server-sent events.
+
+    POST takes the /solve body; GET takes it JSON-encoded in the `request` query
+    parameter, for EventSource clients. Every engine emits a `progress` event
+    every half second while it searches (pool runs relay their workers' combined
+    progress, without a best grid); every solve ends with one
+    `result` event carrying the /solve response, or an `error` event. Closing
+    the connection stops the solver.
+    """
+    if request.method == "OPTIONS":
+        return _build_cors_preflight_response()
+
+    if request.method == "GET":
+        try:
+            data = json.loads(request.args.get("request", ""))
+        except ValueError:
+            return jsonify({"error": "request must be a JSON-encoded solve body"}), 400
+    else:
+        data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({"error": "No data received"}), 400
+
+    events = queue.Queue()
+    disconnected = threading.Event()
+
+    def run():
+        try:
+            result = _solve_puzzle(data, stop_check=disconnected.is_set,
+                                   progress_callback=lambda snapshot: events.put(("progress", snapshot)))
+            events.put(("result", result))
+        except PuzzleRequestError as e:
+            events.put(("error", e.payload))
+        except Exception as e:
+            logger.error(f"Stream solve error: {str(e)}", exc_info=True)
+            events.put(("error", {"error": "Internal server error", "details": str(e)}))
+
+    def generate_events():
+        threading.Thread(target=run, name="solve-stream", daemon=True).start()
+        try:
+            while True:
+                try:
+                    event, payload = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+                if event != "progress":
+                    return
+        finally:
+            disconnected.set()
+
+    response = Response(generate_events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return _corsify_actual_response(response)
+
+@app.route("/solve/batch", methods=["POST", "OPTIONS"])
+@_admitted("solve")
+def solve_batch():
+    """Solve a list of puzzles on the worker pool, streaming one NDJSON line per puzzle as it finishes."""
+    if request.method == "OPTIONS":
+        return _build_cors_preflight_response()
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get("items"), list) or not data["items"]:
+        return jsonify({"error": "items must be a non-empty list"}), 400
+
+    items = data["items"]
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({"error": f"At most {BATCH_MAX_ITEMS} items per batch"}), 400
+
+    max_concurrency = data.get("max_concurrency", solver_pool.workers)
+    if isinstance(max_concurrency, bool) or not isinstance(max_concurrency, int) or not 1 <= max_concurrency <= solver_pool.workers * 2:
+        return jsonify({"error": f"max_concurrency must be an integer between 1 and {solver_pool.workers * 2}"}), 400
+
+    time_limit_ms = data.get("time_limit_ms", BATCH_TIME_LIMIT_MS)
+    if isinstance(time_limit_ms, bool) or not isinstance(time_limit_ms, (int, float)) or not 0 < time_limit_ms <= BATCH_TIME_LIMIT_MS:
+        return jsonify({"error": f"time_limit_ms must be in (0, {BATCH_TIME_LIMIT_MS}]"}), 400
+
+    # Invalid items are answered straight away; the rest go to the pool.
+    lines = []
+    runnable = []
+    for index, item in enumerate(items):
+        item_id = item.get("id") if isinstance(item, dict) else None
+        try:
+            if not isinstance(item, dict):
+                raise ValueError("Missing grid or clues")
+            stored = _stored_puzzle(item)
+            if stored:
+                item = {**item, "grid": stored.solve_grid, "clues": stored.puzzle["clues"]}
+            if not item.get("grid") or not item.get("clues"):
+                raise ValueError("Missing grid or clues")
+            if not stored:
+                _check_puzzle_size(item["grid"], item["clues"])
+            algorithm = str(item.get("algorithm", "HYBRID")).upper()
+            if algorithm not in SOLVER_CLASSES:
+                raise ValueError(f"Invalid algorithm: {algorithm}")
+            runnable.append((index, {
+                "algorithm": algorithm,
+                "grid": item["grid"],
+                "clues": item["clues"],
+                "hybrid_options": _parse_hybrid_options(item.get("hybrid"))
+            }))
+        except ValueError as e:
+            lines.append({"index": index, "id": item_id, "error": str(e)})
+
+    logger.info(f"Batch solve request - Items: {len(items)}, Runnable: {len(runnable)}, Concurrency: {max_concurrency}")
+
+    def _line(payload):
+        return json.dumps(payload, separators=(",", ":")) + "\n"
+
+    def generate_lines():
+        start_time = time.time()
+        solved = 0
+        for line in lines:
+            yield _line(line)
+        try:
+            outcomes = solver_pool.run_batch([item for _, item in runnable], time_limit_ms / 1000, max_concurrency)
+            for outcome in outcomes:
+                index, item = runnable[outcome["index"]]
+                item_id = items[index].get("id")
+                if "error" in outcome:
+                    yield _line({"index": index, "id": item_id, "error": outcome["error"]})
+                    continue
+                result = outcome["result"]
+                success = result.get("status", "").lower() == "success"
+                solved += success
+                yield _line({
+                    "index": index,
+                    "id": item_id,
+                    "method": item["algorithm"],
+                    "success": success,
+                    "solution": result.get("grid", []),
+                    "metrics": {
+                        "execution_time": f"{result['wall_time']:.4f}s",
+                        "words_placed": f"{result.get('words_placed', 0)}/{result.get('total_words', 0)}",
+                        "quality": result.get("quality")
+                    },
+                    "details": {
+                        "status": result.get("status", "unknown"),
+                        "timed_out": outcome["timed_out"]
+                    }
+                })
+        except Exception as e:
+            logger.error(f"Batch solve error: {str(e)}", exc_info=True)
+            yield _line({"error": "Internal server error", "details": str(e)})
+            return
+        elapsed = time.time() - start_time
+        logger.info(f"Batch solve completed - Items: {len(items)}, Solved: {solved}, Time: {elapsed:.4f}s")
+        yield _line({"done": True, "items": len(items), "solved": solved, "execution_time": f"{elapsed:.4f}s"})
+
+    return _corsify_actual_response(Response(generate_lines(), mimetype="application/x-ndjson"))
+
+def _encode_solutions(results, encoding):
+    return {name: {**result, "solution": encode_grid(result["solution"], encoding)} for name, result in results.items()}
+
 @app.route("/analyze", methods=["POST", "OPTIONS"])
+@_admitted("analyze")
 def analyze_complexity():
     """Run all algorithms and compare their complexity"""
     if request.method == "OPTIONS":
@@ -180,28 +696,50 @@ def analyze_complexity():
         if not data:
             return jsonify({"error": "No data received"}), 400
 
-        grid = data.get("grid")
-        clues = data.get("clues")
+        try:
+            stored = _stored_puzzle(data)
+            encoding = _grid_encoding(data)
+            grid = stored.solve_grid if stored else _request_grid(data)
+            clues = stored.puzzle["clues"] if stored else data.get("clues")
+            if not grid or not clues:
+                raise PuzzleRequestError("Missing grid or clues")
+            if not stored:
+                _check_puzzle_size(grid, clues)
+        except PuzzleRequestError as e:
+            return jsonify(e.payload), e.status
+
+        try:
+            time_limit = float(data.get("time_limit_ms", ANALYZE_TIME_LIMIT_MS)) / 1000
+            memory_limit_mb = int(data.get("memory_limit_mb", ANALYZE_MEMORY_LIMIT_MB))
+        except (TypeError, ValueError):
+            return jsonify({"error": "time_limit_ms and memory_limit_mb must be numbers"}), 400
+        if not 0 < time_limit <= ANALYZE_TIME_LIMIT_MS / 1000 or not 0 < memory_limit_mb <= ANALYZE_MEMORY_LIMIT_MB:
+            return jsonify({
+                "error": f"time_limit_ms must be in (0, {ANALYZE_TIME_LIMIT_MS}] and memory_limit_mb in (0, {ANALYZE_MEMORY_LIMIT_MB}]"
+            }), 400
 
-        if not grid or not clues:
-            return jsonify({"error": "Missing grid or clues"}), 400
+        logger.info(f"Analysis request - Grid size: {len(grid)}x{len(grid[0])}, Time limit: {time_limit}s, Memory limit: {memory_limit_mb} MB")
 
-        logger.info(f"Analysis request - Grid size: {len(grid)}x{len(grid[0])}")
+        fingerprint = stored.fingerprint if stored else puzzle_fingerprint(grid, clues)
+        cache_key = (fingerprint, "ANALYZE", time_limit, memory_limit_mb)
+        cached = solution_cache.get(cache_key)
+        if cached is not None:
+            results, trackers = cached
+            complexity_trackers.update(trackers)
+            response = _corsify_actual_response(jsonify(_encode_solutions(results, encoding)))
+            response.headers["X-Solution-Cache"] = "hit"
+            return response
+
+        outcomes = run_isolated(SOLVER_CLASSES, grid, clues, dict_helper, time_limit, memory_limit_mb)
 
-        algorithms = {
-            "DFS": DFSSolver(grid, clues, dict_helper),
-            "A*": AStarSolver(grid, clues, dict_helper),
-            "HYBRID": HybridSolver(grid, clues, dict_helper)
-        }
-        
         results = {}
-        for algo_name, solver in algorithms.items():
-            logger.info(f"Running {algo_name} solver...")
-            start_time = time.time()
-            result = solver.solve()
-            execution_time = time.time() - start_time
-            
-            complexity_trackers[algo_name] = solver.complexity_tracker
+        trackers = {}
+        for algo_name, outcome in outcomes.items():
+            result = outcome.get("result") or {}
+            execution_time = outcome["wall_time"]
+
+            if outcome.get("complexity_tracker") is not None:
+                complexity_trackers[algo_name] = trackers[algo_name] = outcome["complexity_tracker"]
             
             results[algo_name] = {
                 "success": result.get("status", "").lower() == "success",
@@ -210,16 +748,25 @@ def analyze_complexity():
                     "execution_time": f"{execution_time:.4f}s",
                     "memory_usage_kb": result.get("memory_usage_kb", 0),
                     "words_placed": f"{result.get('words_placed', 0)}/{result.get('total_words', 0)}",
+                    "quality": result.get("quality"),
                     "time_complexity": result.get("time_complexity", {}),
-                    "space_complexity": result.get("space_complexity", {})
+                    "space_complexity": result.get("space_complexity", {}),
+                    "candidate_cache": result.get("candidate_cache", {})
                 },
                 "details": {
-                    "status": result.get("status", "unknown")
+                    "status": result.get("status", outcome["status"]),
+                    "run_status": outcome["status"],
+                    "error": outcome.get("error")
                 }
             }
-            logger.info(f"{algo_name} completed - Success: {results[algo_name]['success']}, Time: {execution_time:.4f}s")
+            logger.info(f"{algo_name} {outcome['status']} - Success: {results[algo_name]['success']}, Time: {execution_time:.4f}s")
 
-        return _corsify_actual_response(jsonify(results))
+        # A run cut short by its time or memory limit may finish next time, so only complete comparisons are kept.
+        if all(outcome["status"] == "completed" for outcome in outcomes.values()):
+            solution_cache.put(cache_key, (results, trackers))
+        response = _corsify_actual_response(jsonify(_encode_solutions(results, encoding)))
+        response.headers["X-Solution-Cache"] = "miss"
+        return response
 
     except Exception as e:
         logger.error(f"Analysis error: {str(e)}", exc_info=True)
@@ -229,6 +776,7 @@ def analyze_complexity():
         }), 500)
 
 @app.route("/visualize", methods=["GET", "OPTIONS"])
+@_admitted("light")
 def visualize_complexity():
     """Generate complexity visualization for the last run algorithms"""
     if request.method == "OPTIONS":
@@ -250,6 +798,8 @@ def visualize_complexity():
         if not trackers:
             return jsonify({"error": "No complexity data available. Run solvers first."}), 400
             
+        # matplotlib costs most of a second to import, so only processes that draw charts load it.
+        from solver.analysis.visualizer import ComplexityVisualizer
         if chart_type == "time":
             ComplexityVisualizer.plot_time_complexity(trackers, title)
         elif chart_type == "space":
@@ -271,6 +821,7 @@ def visualize_complexity():
         }), 500)
 
 @app.route("/suggest", methods=["GET", "OPTIONS"])
+@_admitted("light")
 def suggest_words():
     if request.method == "OPTIONS":
         return _build_cors_preflight_response()
@@ -293,157 +844,147 @@ def suggest_words():
             "details": str(e)
         }), 500)
 
+def _generate_puzzle(data, on_attempt=None, max_time_budget_ms=GENERATE_TIME_BUDGET_MS):
+    """Run one /generate request body and return the response data.
+
+    A ready puzzle from the pool is served as is unless the body pins a `seed`;
+    otherwise one is built with its attempts spread over the solver pool, and
+    `on_attempt(attempt, max_attempts)` is called as each attempt finishes. The
+    same seed, size and difficulty always give the same puzzle. A build stops at
+    the body's `time_budget_ms`, which defaults to and may not exceed
+    `max_time_budget_ms`, and returns the best puzzle so far; if no attempt has one
+    yet, the first attempt is finished past the budget. The grids go back in the
+    body's `encoding`.
+    Raises PuzzleRequestError on bad input or when no puzzle can be built.
+    """
+    size = int(data.get('size', 15))
+    difficulty = data.get('difficulty', 'medium')
+    seed = data.get('seed')
+    encoding = _grid_encoding(data)
+
+    logger.info(f"Generation request - Size: {size}, Difficulty: {difficulty}")
+
+    if size < 7 or size > 21:
+        raise PuzzleRequestError("Size must be between 7 and 21")
+
+    if difficulty not in ['easy', 'medium', 'hard']:
+        raise PuzzleRequestError("Difficulty must be easy, medium, or hard")
+
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or not 0 <= seed < 2 ** 63):
+        raise PuzzleRequestError("seed must be an integer between 0 and 2^63 - 1")
+
+    time_budget_ms = data.get('time_budget_ms', max_time_budget_ms)
+    if isinstance(time_budget_ms, bool) or not isinstance(time_budget_ms, (int, float)) or not 0 < time_budget_ms <= max_time_budget_ms:
+        raise PuzzleRequestError(f"time_budget_ms must be in (0, {max_time_budget_ms}]")
+
+    response_data = puzzle_pool.take(size, difficulty) if seed is None else None
+    if response_data is not None:
+        response_data["stats"]["source"] = "pool"
+        logger.info(f"Generation served from pool - Size: {size}, Difficulty: {difficulty}")
+    else:
+        try:
+            response_data = solver_pool.build_puzzle(size, difficulty, on_attempt, seed, time_budget_ms / 1000)
+        except PuzzleBuildError as e:
+            raise PuzzleRequestError(str(e), message=e.message)
+        response_data["stats"]["source"] = "generated"
+        response_data["stats"]["time_budget_ms"] = time_budget_ms
+
+    response_data["puzzle_id"] = puzzle_store.add(dict(response_data))
+
+    return {**response_data, "grid": encode_grid(response_data["grid"], encoding),
+            "empty_grid": encode_grid(response_data["empty_grid"], encoding)}
+
 @app.route('/generate', methods=['POST', 'OPTIONS'])
+@_admitted("generate")
 def generate():
     if request.method == "OPTIONS":
         return _build_cors_preflight_response()
         
     try:
-        data = request.get_json()
-        size = int(data.get('size', 15))
-        difficulty = data.get('difficulty', 'medium')
-
-        logger.info(f"Generation request - Size: {size}, Difficulty: {difficulty}")
-
-        if size < 7 or size > 21:
-            return jsonify({
-                "success": False,
-                "error": "Size must be between 7 and 21"
-            }), 400
-
-        if difficulty not in ['easy', 'medium', 'hard']:
-            return jsonify({
-                "success": False,
-                "error": "Difficulty must be easy, medium, or hard"
-            }), 400
-
-        DENSITY_BOUNDS = {
-            'easy': (0.35, 0.50),
-            'medium': (0.60, 0.69),
-            'hard': (0.80, 1.00)
-        }
-        min_density, max_density = DENSITY_BOUNDS[difficulty]
-
-        if difficulty == 'easy':
-            min_word_length = max(3, size//3)
-            max_word_length = min(12, size)
-            max_attempts = 3
-            word_count_multiplier = 0.7
-        elif difficulty == 'hard':
-            min_word_length = 3
-            max_word_length = size
-            max_attempts = 5
-            word_count_multiplier = 1.3
-        else:
-            min_word_length = max(3, size//4)
-            max_word_length = min(10, size)
-            max_attempts = 4
-            word_count_multiplier = 1.0
-
-        base_word_count = size * 1.5
-        target_word_count = int(base_word_count * word_count_multiplier)
-
-        initial_length = random.randint(min_word_length, min(max_word_length, size//2))
-        possible_words = dict_helper.get_words_by_length(length=initial_length, max_words=100)
-        if not possible_words:
-            return jsonify({
-                "success": False,
-                "error": "No suitable initial words found",
-                "message": "Try a smaller grid size or different difficulty"
-            }), 400
-
-        MAX_GENERATION_TRIES = 15
-        generated_puzzle = None
-        best_puzzle = None
-        best_density = 0.0
-
-        for attempt in range(MAX_GENERATION_TRIES):
-            logger.info(f"Generation attempt {attempt + 1}/{MAX_GENERATION_TRIES} [diff={difficulty}]")
-
-            word_list = []
-            dynamic_max_len = max_word_length + (attempt % 2)
-            for length in range(min_word_length, dynamic_max_len + 1):
-                words = dict_helper.get_words_by_length(
-                    length=length,
-                    max_words=int(target_word_count / 2) + random.randint(0, 20)
-                )
-                word_list.extend(words)
-            random.shuffle(word_list)
+        return _corsify_actual_response(jsonify(_generate_puzzle(request.get_json())))
 
-            initial_word = random.choice(possible_words)['word']
-
-            generator = CrosswordGenerator(size, size)
-            puzzle = generator.generate(
-                initial_word=initial_word,
-                word_list=word_list,
-                max_attempts=max_attempts
-            )
-
-            if not puzzle:
-                continue
+    except PuzzleRequestError as e:
+        return jsonify({"success": False, **e.payload}), e.status
+    except Exception as e:
+        logger.error(f"Generation error: {str(e)}", exc_info=True)
+        return _corsify_actual_response(jsonify({
+            "success": False,
+            "error": "Internal server error",
+            "message": str(e)
+        }), 500)
 
-            density = puzzle.calculate_density()
+def _run_solve_job(payload, context):
+    return _solve_puzzle(payload, stop_check=context.stop_check, max_time_limit_ms=JOB_TIME_LIMIT_MS)
+
+def _run_generate_job(payload, context):
+    def on_attempt(attempt, max_attempts):
+        context.raise_if_cancelled()
+        context.report(attempt=attempt + 1, max_attempts=max_attempts)
+    return _generate_puzzle(payload, on_attempt, max_time_budget_ms=JOB_TIME_LIMIT_MS)
+
+job_queue = JobQueue(
+    {"solve": _run_solve_job, "generate": _run_generate_job},
+    store=SQLiteJobStore(os.environ['JOB_DB_PATH']) if os.environ.get('JOB_DB_PATH') else MemoryJobStore(),
+    workers=int(os.environ.get('JOB_WORKERS', 2)),
+    max_queued=int(os.environ.get('JOB_MAX_QUEUED', 100)),
+    result_ttl=int(os.environ.get('JOB_RESULT_TTL', 3600))
+)
 
-            if density > best_density:
-                best_density = density
-                best_puzzle = puzzle
+@app.route("/jobs", methods=["POST", "OPTIONS"])
+def create_job():
+    """Queue a solve or generate request and return its job id straight away."""
+    if request.method == "OPTIONS":
+        return _build_cors_preflight_response()
 
-            if min_density <= density <= max_density:
-                generated_puzzle = puzzle
-                break
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({"error": "No data received"}), 400
 
-        final_puzzle = generated_puzzle or best_puzzle
+    job_type = data.get("type")
+    params = data.get("params", {})
+    priority = data.get("priority", 0)
+    if job_type not in job_queue.handlers:
+        return jsonify({"error": f"type must be one of {sorted(job_queue.handlers)}"}), 400
+    if not isinstance(params, dict):
+        return jsonify({"error": "params must be an object"}), 400
+    if isinstance(priority, bool) or not isinstance(priority, int) or not 0 <= priority <= MAX_JOB_PRIORITY:
+        return jsonify({"error": f"priority must be an integer between 0 and {MAX_JOB_PRIORITY}"}), 400
 
-        if not final_puzzle:
-            return jsonify({
-                "success": False,
-                "error": "Failed to generate any valid puzzle",
-                "message": "Please try again with different settings."
-            }), 400
+    try:
+        job = job_queue.submit(job_type, params, priority)
+    except RuntimeError as e:
+        return _corsify_actual_response(jsonify({"error": str(e)}), 503)
 
-        final_density = final_puzzle.calculate_density()
-        used_fallback = generated_puzzle is None
+    response = jsonify(job)
+    response.headers["Location"] = f"/jobs/{job['id']}"
+    return _corsify_actual_response(response, 202)
 
-        if used_fallback:
-            logger.warning(f"Used fallback puzzle with density={final_density:.2%} "
-                          f"(target: {min_density:.2%}-{max_density:.2%})")
+@app.route("/jobs/<job_id>", methods=["GET", "DELETE", "OPTIONS"])
+def job_status(job_id):
+    """GET a job's status, progress and result; DELETE cancels it."""
+    if request.method == "OPTIONS":
+        return _build_cors_preflight_response()
 
-        empty_grid = final_puzzle.empty_grid
-        
-        across, down = final_puzzle.analyze_grid(for_empty_grid=True)
-        numbered_positions = {(slot.x, slot.y): slot.number for slot in across + down}
-        
-        for y in range(final_puzzle.height):
-            for x in range(final_puzzle.width):
-                if (x, y) in numbered_positions:
-                    empty_grid[y][x] = str(numbered_positions[(x, y)])
-        
-        response_data = {
-            "success": True,
-            "grid": final_puzzle.grid,
-            "empty_grid": empty_grid,   
-            "clues": final_puzzle.get_clues(),
-            "stats": {
-                "word_count": len(final_puzzle.words),
-                "difficulty": difficulty,
-                "size": size,
-                "density": final_puzzle.calculate_density(),
-                "used_fallback": used_fallback
-            }
-        }
+    job = job_queue.cancel(job_id) if request.method == "DELETE" else job_queue.get(job_id)
+    if job is None:
+        return _corsify_actual_response(jsonify({"error": "Job not found"}), 404)
+    return _corsify_actual_response(jsonify(job))
 
-        logger.info(f"Generation successful - Word count: {len(final_puzzle.words)}, Density: {final_density:.2%}")
-        return _corsify_actual_response(jsonify(response_data))
+@app.route("/puzzles/<puzzle_id>", methods=["GET", "OPTIONS"])
+@_admitted("light")
+def get_puzzle(puzzle_id):
+    """Return a generated puzzle as /generate first sent it."""
+    if request.method == "OPTIONS":
+        return _build_cors_preflight_response()
 
-    except Exception as e:
-        logger.error(f"Generation error: {str(e)}", exc_info=True)
-        return _corsify_actual_response(jsonify({
-            "success": False,
-            "error": "Internal server error",
-            "message": str(e)
-        }), 500)
+    stored = puzzle_store.get(puzzle_id)
+    if stored is None:
+        return _corsify_actual_response(jsonify({"error": "Unknown puzzle_id"}), 404)
+    return _corsify_actual_response(jsonify({**stored.puzzle, "puzzle_id": puzzle_id}))
 
+# Renderers are named rather than imported: PIL and reportlab load on the first download, not at boot.
 @app.route('/download', methods=['POST', 'OPTIONS'])
+@_admitted("download")
 def download():
     if request.method == "OPTIONS":
         return _build_cors_preflight_response()
@@ -452,28 +993,44 @@ def download():
         data = request.get_json()
         puzzle = data.get('puzzle')
         format = data.get('format', 'png').lower()
-        show_answers = data.get('showAnswers', False)
+        show_answers = bool(data.get('showAnswers', False))
         
         logger.info(f"Download request - Format: {format}, Show answers: {show_answers}")
 
-        if not puzzle:
-            return _corsify_actual_response(jsonify({'error': 'No puzzle data provided'}), 400)
+        try:
+            stored = _stored_puzzle(data)
+            if not puzzle and not stored:
+                raise PuzzleRequestError('No puzzle data provided')
+            if not stored:
+                if not isinstance(puzzle, dict):
+                    raise PuzzleRequestError('puzzle must be an object')
+                _check_puzzle_size(puzzle.get('grid'), puzzle.get('clues'))
+        except PuzzleRequestError as e:
+            return _corsify_actual_response(jsonify(e.payload), e.status)
         
-        if format == 'png':
-            image_data = generate_png_image(puzzle, show_answers)
-            response = make_response(image_data)
-            response.headers['Content-Type'] = 'image/png'
-            response.headers['Content-Disposition'] = 'attachment; filename=crossword.png'
-            return _corsify_actual_response(response)
-            
-        elif format == 'pdf':
-            pdf_data = generate_pdf(puzzle, show_answers)
-            response = make_response(pdf_data)
-            response.headers['Content-Type'] = 'application/pdf'
-            response.headers['Content-Disposition'] = 'attachment; filename=crossword.pdf'
-            return _corsify_actual_response(response)
-            
-        return _corsify_actual_response(jsonify({'error': 'Invalid format. Use "png" or "pdf".'}), 400)
+        # PIL and reportlab are only loaded by processes that serve downloads.
+        from generate_downloadables import generate_pdf, generate_png_image
+        download_formats = {
+            'png': (generate_png_image, 'image/png'),
+            'pdf': (generate_pdf, 'application/pdf')
+        }
+        if format not in download_formats:
+            return _corsify_actual_response(jsonify({'error': 'Invalid format. Use "png" or "pdf".'}), 400)
+
+        renderer, content_type = download_formats[format]
+        # A stored puzzle is drawn once per format and answer setting, then served from the store.
+        # Identical downloads that overlap share one drawing either way.
+        if stored:
+            key = (stored.puzzle_id, format, show_answers)
+            file_data, coalesced = download_flights.do(key, lambda: puzzle_store.render(stored, format, show_answers, renderer))
+        else:
+            payload_hash = hashlib.sha256(json.dumps(puzzle, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+            file_data, coalesced = download_flights.do((payload_hash, format, show_answers), lambda: renderer(puzzle, show_answers))
+        response = make_response(file_data)
+        response.headers['Content-Type'] = content_type
+        response.headers['Content-Disposition'] = f'attachment; filename=crossword.{format}'
+        response.headers['X-Coalesced'] = "true" if coalesced else "false"
+        return _corsify_actual_response(response)
         
     except Exception as e:
         logger.error(f"Download error: {str(e)}", exc_info=True)
@@ -486,6 +1043,13 @@ def not_found(error):
         "message": "The requested endpoint does not exist."
     }), 404)
 
+@app.errorhandler(413)
+def request_too_large(error):
+    return _corsify_actual_response(jsonify({
+        "error": "Request too large",
+        "message": f"Request bodies may be at most {app.config['MAX_CONTENT_LENGTH']} bytes."
+    }), 413)
+
 @app.errorhandler(500)
 def internal_error(error):
     logger.error(f"Internal server error: {str(error)}")
@@ -494,6 +1058,14 @@ def internal_error(error):
         "message": "An unexpected error occurred."
     }), 500)
 
+# How long this process took to become ready to serve, so boot regressions show up in /health;
+# profile_startup.py breaks the import part down by module.
+startup_timings = {
+    "boot_seconds": round(time.time() - psutil.Process().create_time(), 3),
+    "dictionary_seconds": round(dict_helper.load_seconds, 3)
+}
+logger.info(f"Server ready - Boot: {startup_timings['boot_seconds']}s, Dictionary: {startup_timings['dictionary_seconds']}s")
+
 if __name__ == "__main__":
     port = int(os.environ.get('PORT', 5000))
     
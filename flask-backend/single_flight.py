@@ -0,0 +1,54 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its outcome.
+
+    The first caller for a key runs the work; callers with the same key that
+    arrive while it runs wait for it and get the same result, or the same
+    exception. Nothing is kept once the call returns, so this only merges
+    requests that overlap in time; SolutionCache covers repeats.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, work: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return `work()`'s result for `key` and whether it was shared from a call already running."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = work()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            requests = self.executed + self.coalesced
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+                "coalesced_rate": round(self.coalesced / requests, 4) if requests else 0.0
+            }
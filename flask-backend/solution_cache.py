@@ -0,0 +1,81 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+CLUE_FIELDS = ("number", "x", "y", "length")
+
+def puzzle_fingerprint(grid: List[List[str]], clues: Dict[str, List[Dict]]) -> str:
+    """Hash of everything a solver reads from a puzzle, in one canonical form.
+
+    Blank cells read the same whether sent as ' ' or '.', clue lists are sorted
+    by number and position, and runs of whitespace in clue text collapse to one
+    space, so the same puzzle sent twice by different clients hashes the same.
+    """
+    canonical = {
+        "grid": ["".join('.' if cell in (' ', '.', '') else str(cell).upper() for cell in row) for row in grid],
+        "clues": {
+            direction: sorted(
+                [
+                    [clue.get(field) for field in CLUE_FIELDS]
+                    + [" ".join(str(clue.get("clue", "")).split()), str(clue.get("answer") or "").strip().upper()]
+                    for clue in clues.get(direction) or []
+                ],
+                key=lambda entry: [str(value) for value in entry]
+            )
+            for direction in ("across", "down")
+        }
+    }
+    encoded = json.dumps(canonical, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SolutionCache:
+    """Thread-safe LRU of finished responses, each kept for at most `ttl` seconds.
+
+    Values are handed back as stored, so callers must not mutate them.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """Return the cached value, or None on a miss or an expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Dict) -> Dict:
+        """Store a value, evicting the least recently used entries past `max_entries`."""
+        if self.max_entries <= 0:
+            return value
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
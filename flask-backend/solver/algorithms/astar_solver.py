@@ -1,10 +1,14 @@
 import heapq
+import math
 from typing import List, Dict, Set, Tuple, Optional
 from ..core.base_solver import BaseCrosswordSolver
 from ..core.slot_manager import SlotManager
 from ..core.constraints import ConstraintChecker
 
 class AStarSolver(BaseCrosswordSolver):
+    SLOT_COST = 10
+    FEASIBILITY_WEIGHT = 3
+    DEAD_END_PENALTY = 6
     
     def __init__(self, grid: List[List[str]], clues: Dict[str, List[Dict]], dict_helper, enable_memory_profiling: bool = False):
         super().__init__(grid, clues, enable_memory_profiling)
@@ -14,12 +18,20 @@ class AStarSolver(BaseCrosswordSolver):
         self.slot_graph = self.slot_manager.build_slot_graph(self.slots)
         self.constraint_checker = ConstraintChecker(self.solution, self.slot_graph)
         
+        self.slot_cells = {
+            (slot['number'], slot['direction']): self._get_slot_cells(slot) for slot in self.slots
+        }
         self.slot_constraints = self._compute_constraints()
         self.slot_ordering = self._get_ordering()
         
         self._state_cache = {}
-        self._candidate_cache = {}
+        self._prune_dead_ends = True
         
+    def _get_slot_cells(self, slot: Dict) -> List[Tuple[int, int]]:
+        if slot['direction'] == 'across':
+            return [(slot['x'] + i, slot['y']) for i in range(slot['length'])]
+        return [(slot['x'], slot['y'] + i) for i in range(slot['length'])]
+    
     def _compute_constraints(self) -> Dict[Tuple[int, str], int]:
         constraints = {}
         for slot in self.slots:
@@ -58,9 +70,12 @@ class AStarSolver(BaseCrosswordSolver):
         return ''.join(pattern)
     
     def _get_candidates(self, slot: Dict, grid: List[List[str]], use_fallback: bool = True) -> List[Tuple[str, int]]:
-        cache_key = (slot['number'], slot['direction'], self._hash_grid(grid))
-        if cache_key in self._candidate_cache:
-            return self._candidate_cache[cache_key]
+        slot_id = (slot['number'], slot['direction'])
+        pattern = self._get_pattern_from_grid(slot, grid)
+        if use_fallback:
+            cached = self.candidate_cache.get(slot_id, pattern)
+            if cached is not None:
+                return cached
         
         candidates = []
         
@@ -77,18 +92,12 @@ class AStarSolver(BaseCrosswordSolver):
             candidates = self._get_fallback_candidates(slot, grid)
         
         candidates.sort(key=lambda x: -x[1])
-        self._candidate_cache[cache_key] = candidates
+        if use_fallback:
+            self.candidate_cache.put(slot_id, pattern, candidates)
         return candidates
     
     def _get_dict_candidates(self, slot: Dict) -> List:
-        try:
-            return self.dict_helper.get_possible_words(
-                clue=slot['clue'],
-                max_words=500,
-                length_range=(slot['length'], slot['length'])
-            )
-        except Exception:
-            return []
+        return self._get_resolved_clue(slot).clue_matches(500)
     
     def _extract_word(self, candidate) -> str:
         if isinstance(candidate, dict) and 'word' in candidate:
@@ -100,7 +109,7 @@ class AStarSolver(BaseCrosswordSolver):
         
         if hasattr(self.dict_helper, 'get_alternative_spellings'):
             try:
-                alt_words = self.dict_helper.get_alternative_spellings(slot['clue'], slot['length'])
+                alt_words = self._get_resolved_clue(slot).alternative_spellings(should_stop=self._should_stop)
                 for candidate in alt_words:
                     word = self._extract_word(candidate)
                     if len(word) == slot['length'] and self._fits(slot, word, grid):
@@ -167,8 +176,7 @@ class AStarSolver(BaseCrosswordSolver):
                         if other_char != '.' and other_char == word[word_pos]:
                             score += 2
         
-        exact_match = self.dict_helper.find_word_by_exact_clue(slot['clue'])
-        if exact_match and exact_match['word'].upper() == word:
+        if self._get_resolved_clue(slot).exact_word == word:
             score += 4
         
         word_data = self.dict_helper.get_clue_for_word(word)
@@ -206,6 +214,9 @@ class AStarSolver(BaseCrosswordSolver):
         if not self.slots:
             return self._create_result(True, 0, 0)
         
+        self._resolve_slot_clues()
+        if self.stopped:
+            return self._create_result(False, self._count_filled_words(), len(self.slots))
         processing_order = self.slot_ordering
         
         initial_state = AStarState(
@@ -215,6 +226,11 @@ class AStarSolver(BaseCrosswordSolver):
             slot_index=0
         )
         initial_state.heuristic = self._calculate_heuristic(initial_state)
+        if initial_state.heuristic == math.inf:
+            # The given letters already rule out every dictionary word somewhere,
+            # so keep searching for the best partial fill instead of pruning.
+            self._prune_dead_ends = False
+            initial_state.heuristic = self._calculate_heuristic(initial_state)
         initial_state.priority = initial_state.cost + initial_state.heuristic
         
         open_set = [initial_state]
@@ -225,9 +241,12 @@ class AStarSolver(BaseCrosswordSolver):
         max_iterations = 5000
         
         while open_set and iteration < max_iterations:
+            if self._should_stop():
+                break
             iteration += 1
             
             current_state = heapq.heappop(open_set)
+            self.search_grid = current_state.grid
             
             if current_state.slot_index >= len(processing_order):
                 self.solution = current_state.grid
@@ -251,16 +270,12 @@ class AStarSolver(BaseCrosswordSolver):
                 
                 self._state_cache[next_state.grid_hash] = next_state
                 heapq.heappush(open_set, next_state)
+                self._record_fill(next_state.slot_index, next_state.grid)
             
             self.complexity_tracker.increment_operations()
         
-        if open_set:
-            best_state = min(open_set, key=lambda s: s.heuristic)
-            self.solution = best_state.grid
-            filled_count = self._count_filled_words()
-            return self._create_result(False, filled_count, len(self.slots))
-        
-        return self._create_result(False, 0, len(self.slots))
+        # Out of budget or frontier: the result falls back to the deepest state generated.
+        return self._create_result(False, self._count_filled_words(), len(self.slots))
     
     def _get_successors(self, state: 'AStarState', processing_order: List[Dict]) -> List['AStarState']:
         successors = []
@@ -287,29 +302,45 @@ class AStarSolver(BaseCrosswordSolver):
                 cost=state.cost + 1,
                 slot_index=current_index + 1
             )
+            new_state.word_score = score
             new_state.heuristic = self._calculate_heuristic(new_state)
+            if new_state.heuristic == math.inf:
+                continue
             new_state.priority = new_state.cost + new_state.heuristic
             
             successors.append(new_state)
         
         return successors
     
-    def _calculate_heuristic(self, state: 'AStarState') -> int:
+    def _calculate_heuristic(self, state: 'AStarState') -> float:
         remaining = len(self.slots) - state.slot_index
         
         if remaining == 0:
             return 0
         
-        heuristic = remaining * 10 
+        heuristic = remaining * self.SLOT_COST
+        grid = state.grid
         
-        for i in range(state.slot_index, min(state.slot_index + 3, len(self.slot_ordering))):
-            if i < len(self.slot_ordering):
-                slot = self.slot_ordering[i]
-                slot_key = (slot['number'], slot['direction'])
-                heuristic += self.slot_constraints.get(slot_key, 0) * 5
+        for slot in self.slot_ordering[state.slot_index:]:
+            cells = self.slot_cells[(slot['number'], slot['direction'])]
+            pattern = ''.join(grid[y][x] for x, y in cells)
+            if pattern.count('.') == len(pattern):
+                continue
+            
+            penalty = self._pattern_penalty(pattern)
+            if penalty == math.inf:
+                return math.inf
+            heuristic += penalty
         
         return heuristic
     
+    def _pattern_penalty(self, pattern: str) -> float:
+        """Score how unlikely a partially filled slot is to be fillable; inf when it cannot be."""
+        matches = self.dict_helper.count_pattern_matches(pattern)
+        if matches == 0:
+            return math.inf if self._prune_dead_ends else self.DEAD_END_PENALTY
+        return round(self.FEASIBILITY_WEIGHT * math.log2(1 + 1 / matches))
+    
     def _place_word(self, grid: List[List[str]], slot: Dict, word: str) -> List[List[str]]:
         new_grid = [row[:] for row in grid]
         for i, char in enumerate(word):
@@ -348,6 +379,7 @@ class AStarState:
         self.slot_index = slot_index
         self.heuristic = 0
         self.priority = 0
+        self.word_score = 0
         self.grid_hash = self._compute_hash()
     
     def _compute_hash(self) -> str:
@@ -356,4 +388,6 @@ class AStarState:
         return f"{grid_str}|{slots_str}|{self.slot_index}"
     
     def __lt__(self, other):
-        return self.priority < other.priority
\ No newline at end of file
+        if self.priority != other.priority:
+            return self.priority < other.priority
+        return self.word_score > other.word_score
\ No newline at end of file
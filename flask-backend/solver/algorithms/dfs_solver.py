@@ -8,14 +8,21 @@ logger = logging.getLogger(__name__)
 
 
 class DFSSolver(BaseCrosswordSolver):
-    def __init__(self, grid: List[List[str]], clues: Dict[str, List[Dict]], dict_helper):
-        super().__init__(grid, clues, False)
+    def __init__(self, grid: List[List[str]], clues: Dict[str, List[Dict]], dict_helper, enable_memory_profiling: bool = False,
+                 decompose: bool = True):
+        super().__init__(grid, clues, enable_memory_profiling)
         self.dict_helper = dict_helper
         self.slot_manager = SlotManager(self.solution, clues)
         self.slots = self.slot_manager.get_word_slots()
         self.slot_graph = self.slot_manager.build_slot_graph(self.slots)
         self.constraint_checker = ConstraintChecker(self.solution, self.slot_graph)
         self.slot_candidates: List[Tuple[Dict, List[str]]] = []
+        self.nodes_visited = 0
+        self.decompose = decompose
+        self.decompositions = 0
+        self._depth = 0
+        self._slot_cells: List[List[Tuple[int, int]]] = []
+        self._slot_crossings: List[List[Tuple[int, Tuple[int, int]]]] = []
 
         logger.info(f"DFSSolver initialized with {len(self.slots)} slots")
         logger.debug("Initial grid state:")
@@ -30,17 +37,15 @@ class DFSSolver(BaseCrosswordSolver):
             logger.info("No slots to fill")
             return self._create_result(True, 0, 0)
 
-        self.slot_candidates = self._get_slot_candidates()
-        if not self.slot_candidates:
+        if not self._prepare_search():
             logger.warning("No valid candidates found")
             return self._create_result(False, 0, len(self.slots))
 
-        self.slot_candidates.sort(key=lambda x: (len(x[1]), -self._get_constraint_level(x[0])))
-
         logger.info("Slot processing order:")
         for i, (slot, candidates) in enumerate(self.slot_candidates):
             logger.info(f"  {i+1}. Slot {slot['number']} {slot['direction']}: {len(candidates)} candidates")
 
+        self._depth = 0
         success = self._dfs(0)
 
         if success:
@@ -52,12 +57,100 @@ class DFSSolver(BaseCrosswordSolver):
             logger.warning("No solution found")
 
         words_placed = self._count_filled_words()
-        return self._create_result(success, words_placed, len(self.slots))
+        result = self._create_result(success, words_placed, len(self.slots))
+        result["decompositions"] = self.decompositions
+        return result
+
+    def _prepare_search(self) -> bool:
+        """Resolve clues and fix the slot order; False if some slot has no candidates at all."""
+        self._resolve_slot_clues()
+        self.slot_candidates = self._get_slot_candidates()
+        if not self.slot_candidates:
+            return False
+
+        self.slot_candidates.sort(key=lambda x: (len(x[1]), -self._get_constraint_level(x[0])))
+        self._index_slot_geometry()
+        return True
+
+    def _index_slot_geometry(self):
+        """Cells of each slot and, per slot, the slots it crosses with the shared cell, by search index."""
+        self._slot_cells = []
+        cell_owners: Dict[Tuple[int, int], List[int]] = {}
+        for idx, (slot, _) in enumerate(self.slot_candidates):
+            if slot['direction'] == 'across':
+                cells = [(slot['x'] + i, slot['y']) for i in range(slot['length'])]
+            else:
+                cells = [(slot['x'], slot['y'] + i) for i in range(slot['length'])]
+            self._slot_cells.append(cells)
+            for cell in cells:
+                cell_owners.setdefault(cell, []).append(idx)
+
+        self._slot_crossings = [[] for _ in self.slot_candidates]
+        for cell, owners in cell_owners.items():
+            for idx in owners:
+                self._slot_crossings[idx].extend((other, cell) for other in owners if other != idx)
+
+    def split_search(self, depth: int) -> List[List[str]]:
+        """Enumerate the consistent fills of the first `depth` slots in search order.
+
+        Each fill is the root of an independent subtree that solve_subtree can search
+        in another process, since the slot order only depends on the puzzle.
+        """
+        if not self.slot_candidates and not self._prepare_search():
+            return []
+        prefixes: List[List[str]] = []
+        self._collect_prefixes(0, min(depth, len(self.slot_candidates)), [], prefixes)
+        return prefixes
+
+    def _collect_prefixes(self, slot_idx: int, depth: int, prefix: List[str], prefixes: List[List[str]]):
+        if slot_idx >= depth:
+            prefixes.append(list(prefix))
+            return
+
+        slot, candidates = self.slot_candidates[slot_idx]
+        for word in candidates:
+            if not self._fits(slot, word):
+                continue
+
+            placed_positions = self._place_word(slot, word)
+            future_slots = {idx for idx in self._get_affected_slots(slot) if idx > slot_idx}
+            if self._check_future_constraints(future_slots):
+                prefix.append(word)
+                self._collect_prefixes(slot_idx + 1, depth, prefix, prefixes)
+                prefix.pop()
+            self._remove_word(placed_positions)
+
+    def solve_subtree(self, prefix: List[str], slot_candidates: Optional[List[Tuple[Dict, List[str]]]] = None) -> Dict:
+        """Search only below `prefix`, the words for the first len(prefix) slots in search order.
+
+        Passing the splitting solver's `slot_candidates` skips recomputing the slot order.
+        The same solver can search several subtrees in turn; resolved clues are kept
+        and the grid is reset to the puzzle's given letters each time.
+        """
+        self._start_performance_tracking()
+        self.nodes_visited = 0
+        for row, original in zip(self.solution, self.original_grid):
+            row[:] = [cell if cell not in [' ', '.'] else '.' for cell in original]
+
+        if slot_candidates is not None:
+            self.slot_candidates = slot_candidates
+            self._index_slot_geometry()
+        elif not self.slots or not self._prepare_search():
+            return self._create_result(not self.slots, 0, len(self.slots))
+
+        for (slot, _), word in zip(self.slot_candidates, prefix):
+            self._place_word(slot, word)
+        self._depth = len(prefix)
+
+        success = self._dfs(len(prefix))
+        return self._create_result(success, self._count_filled_words(), len(self.slots))
 
     def _get_slot_candidates(self) -> List[Tuple[Dict, List[str]]]:
         candidates_list = []
 
         for slot in self.slots:
+            if self._should_stop():
+                return []
             logger.debug(f"Getting candidates for slot {slot['number']} {slot['direction']}")
 
             candidates = self._get_candidates(slot)
@@ -77,16 +170,21 @@ class DFSSolver(BaseCrosswordSolver):
     def _get_candidates(self, slot: Dict) -> List[str]:
         self.complexity_tracker.increment_operations()
 
+        slot_id = (slot['number'], slot['direction'])
+        pattern = self._get_pattern(slot)
+        cached = self.candidate_cache.get(slot_id, pattern)
+        if cached is not None:
+            return cached
+
         slot_len = slot['length']
         valid_words = []
 
         try:
-            if hasattr(self.dict_helper, 'find_word_by_exact_clue'):
-                exact_match = self.dict_helper.find_word_by_exact_clue(slot['clue'])
-                if exact_match and len(exact_match.get('word', '')) == slot_len:
-                    word = exact_match['word'].upper()
-                    if self._fits(slot, word):
-                        valid_words.append(word)
+            exact_match = self._get_resolved_clue(slot).exact_match
+            if exact_match and len(exact_match.get('word', '')) == slot_len:
+                word = exact_match['word'].upper()
+                if self._fits(slot, word):
+                    valid_words.append(word)
         except Exception:
             logger.exception("Error in exact clue match")
 
@@ -110,17 +208,10 @@ class DFSSolver(BaseCrosswordSolver):
         except Exception:
             logger.exception("Error getting dictionary candidates")
 
-        return list(dict.fromkeys(valid_words))
+        return self.candidate_cache.put(slot_id, pattern, list(dict.fromkeys(valid_words)))
 
     def _get_dict_candidates(self, slot: Dict, slot_len: int) -> List:
-        try:
-            return self.dict_helper.get_possible_words(
-                clue=slot['clue'], max_words=1000, length_range=(slot_len, slot_len)
-            )
-        except TypeError:
-            return self.dict_helper.get_possible_words(max_words=1000, length_range=(slot_len, slot_len))
-        except Exception:
-            return []
+        return self._get_resolved_clue(slot).clue_matches(1000)
 
     def _extract_word(self, candidate) -> Optional[str]:
         if isinstance(candidate, dict) and 'word' in candidate:
@@ -183,14 +274,7 @@ class DFSSolver(BaseCrosswordSolver):
         return candidates
 
     def _get_broad_candidates(self, slot: Dict, slot_len: int) -> List:
-        try:
-            return self.dict_helper.get_possible_words(
-                clue=slot['clue'], max_words=5000, length_range=(slot_len, slot_len)
-            )
-        except TypeError:
-            return self.dict_helper.get_possible_words(max_words=5000, length_range=(slot_len, slot_len))
-        except Exception:
-            return []
+        return self._get_resolved_clue(slot).clue_matches(5000)
 
     def _get_pattern_candidates(self, slot: Dict, slot_len: int) -> List:
         pattern = self._get_pattern(slot)
@@ -269,13 +353,67 @@ class DFSSolver(BaseCrosswordSolver):
         return True
 
     def _dfs(self, slot_idx: int) -> bool:
-        if slot_idx >= len(self.slot_candidates):
+        return self._solve_remaining(list(range(slot_idx, len(self.slot_candidates))))
+
+    def _solve_remaining(self, remaining: List[int]) -> bool:
+        """Fill the remaining slots, one independent region at a time once they fall apart.
+
+        Regions that no longer share an empty cell cannot affect each other, so a
+        failing region fails the whole branch without retrying the other regions'
+        alternatives.
+        """
+        if not self.decompose or len(remaining) < 2:
+            return self._search(remaining)
+
+        components = self._split_remaining(remaining)
+        if len(components) == 1:
+            return self._search(remaining)
+
+        self.decompositions += 1
+        empty_cells = [(x, y) for idx in remaining for x, y in self._slot_cells[idx] if self.solution[y][x] == '.']
+        depth = self._depth
+        for component in components:
+            if not self._search(component):
+                for x, y in empty_cells:
+                    self.solution[y][x] = '.'
+                self._depth = depth
+                return False
+        return True
+
+    def _split_remaining(self, remaining: List[int]) -> List[List[int]]:
+        unassigned = set(remaining)
+        seen = set()
+        components = []
+        for start in remaining:
+            if start in seen:
+                continue
+            seen.add(start)
+            stack = [start]
+            component = []
+            while stack:
+                idx = stack.pop()
+                component.append(idx)
+                for other, (x, y) in self._slot_crossings[idx]:
+                    if other in unassigned and other not in seen and self.solution[y][x] == '.':
+                        seen.add(other)
+                        stack.append(other)
+            components.append(sorted(component))
+        return components
+
+    def _search(self, remaining: List[int]) -> bool:
+        self.nodes_visited += 1
+        if not remaining:
             return True
 
+        slot_idx, rest = remaining[0], remaining[1:]
+        unassigned = set(rest)
         slot, candidates = self.slot_candidates[slot_idx]
         logger.debug(f"Processing slot {slot['number']} {slot['direction']} (index {slot_idx})")
 
         for word in candidates:
+            if self._should_stop():
+                return False
+
             logger.debug(f"Trying '{word}' in slot {slot['number']}")
 
             if not self._fits(slot, word):
@@ -286,16 +424,19 @@ class DFSSolver(BaseCrosswordSolver):
             logger.debug(f"Placed '{word}', affected {len(placed_positions)} cells")
 
             affected_slots = self._get_affected_slots(slot)
-            future_slots = {idx for idx in affected_slots if idx > slot_idx}
+            future_slots = {idx for idx in affected_slots if idx in unassigned}
 
             if not self._check_future_constraints(future_slots):
                 logger.debug(f"Future constraints failed for '{word}'")
                 self._remove_word(placed_positions)
                 continue
 
-            if self._dfs(slot_idx + 1):
+            self._depth += 1
+            self._record_fill(self._depth, self.solution)
+            if self._solve_remaining(rest):
                 return True
 
+            self._depth -= 1
             self._remove_word(placed_positions)
             logger.debug(f"Backtracked '{word}' from slot {slot['number']}")
 
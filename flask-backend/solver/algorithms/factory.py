@@ -0,0 +1,29 @@
+import importlib
+from typing import Dict, List, Type
+from ..core.base_solver import BaseCrosswordSolver
+
+# Engine name -> (module, class); each module is imported the first time its engine runs.
+SOLVER_CLASSES = {
+    "DFS": (".dfs_solver", "DFSSolver"),
+    "A*": (".astar_solver", "AStarSolver"),
+    "HYBRID": (".hybrid_solver", "HybridSolver")
+}
+
+def solver_class(algorithm: str) -> Type[BaseCrosswordSolver]:
+    """The solver class for `algorithm`; raises ValueError for unknown names."""
+    if algorithm not in SOLVER_CLASSES:
+        raise ValueError(f"Invalid algorithm: {algorithm}")
+    module_name, class_name = SOLVER_CLASSES[algorithm]
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+def create_solver(algorithm: str, grid: List[List[str]], clues: Dict[str, List[Dict]], dict_helper,
+                  enable_memory_profiling: bool = False, hybrid_options: Dict = None) -> BaseCrosswordSolver:
+    """Build the solver for `algorithm`; raises ValueError for unknown names.
+
+    `hybrid_options` are passed to HybridSolver only, so one request can carry them
+    whichever engine ends up running.
+    """
+    cls = solver_class(algorithm)
+    if algorithm == "HYBRID":
+        return cls(grid, clues, dict_helper, enable_memory_profiling, **(hybrid_options or {}))
+    return cls(grid, clues, dict_helper, enable_memory_profiling)
@@ -0,0 +1,289 @@
+import heapq
+import math
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+from typing import List, Dict, Optional, Tuple
+from ..core.base_solver import BaseCrosswordSolver
+from ..core.slot_manager import SlotManager
+from ..core.constraints import ConstraintChecker
+from .astar_solver import AStarSolver, AStarState
+
+class HDAStarSolver(BaseCrosswordSolver):
+    """Hash-distributed A*: each worker process owns the states whose hash maps to it.
+
+    Workers expand their own open lists with AStarSolver's successor function and
+    heuristic, batch the successors owned by other workers, and send them over
+    per-worker queues. The parent stops the search at the first complete fill, at
+    the expansion budget, or once every worker is idle with no batch in flight.
+    """
+
+    BATCH_SIZE = 16
+    FLUSH_INTERVAL = 8
+    POLL_INTERVAL = 0.01
+    MAX_EXPANSIONS = 5000
+
+    def __init__(self, grid: List[List[str]], clues: Dict[str, List[Dict]], dict_helper,
+                 enable_memory_profiling: bool = False, workers: Optional[int] = None,
+                 max_expansions: Optional[int] = None):
+        super().__init__(grid, clues, enable_memory_profiling)
+        self.dict_helper = dict_helper
+        self.slot_manager = SlotManager(self.solution, clues)
+        self.slots = self.slot_manager.get_word_slots()
+        self.slot_graph = self.slot_manager.build_slot_graph(self.slots)
+        self.constraint_checker = ConstraintChecker(self.solution, self.slot_graph)
+
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_expansions = max_expansions or self.MAX_EXPANSIONS
+        self.hda_stats = {}
+
+    def solve(self) -> Dict:
+        self._start_performance_tracking()
+
+        if not self.slots:
+            return self._create_result(True, 0, 0)
+
+        context = _fork_context()
+        n = self.workers
+        inboxes = [context.Queue() for _ in range(n)]
+        results = context.Queue()
+        stop = context.RawValue('b', 0)
+        idle = context.RawArray('b', n)
+        sent = context.RawArray('q', n + 1)
+        received = context.RawArray('q', n)
+        expansions = context.RawArray('q', n)
+
+        # The parent seeds the search; its batches are counted in the last `sent` slot.
+        seed = AStarSolver(self.original_grid, self.clues, self.dict_helper)
+        initial = _encode(AStarState(grid=seed.solution, filled_slots=set(), cost=0, slot_index=0))
+        sent[n] += 1
+        inboxes[_owner(seed.solution, 0, n)].put([initial])
+
+        processes = [
+            context.Process(
+                target=_hda_worker,
+                args=(rank, n, self.original_grid, self.clues, self.dict_helper, inboxes, results,
+                      stop, idle, sent, received, expansions),
+                daemon=True
+            )
+            for rank in range(n)
+        ]
+        started = time.time()
+        for process in processes:
+            process.start()
+
+        solution_grid = None
+        termination = None
+        previous_counts = None
+        while termination is None:
+            try:
+                kind, payload = results.get(timeout=self.POLL_INTERVAL)
+                if kind == "solution":
+                    solution_grid = payload
+                    termination = "solution"
+                continue
+            except queue.Empty:
+                pass
+
+            if self._should_stop():
+                termination = "stopped"
+            elif sum(expansions) >= self.max_expansions:
+                termination = "max_expansions"
+            else:
+                counts = (sum(sent), sum(received))
+                if all(idle) and counts[0] == counts[1] and counts == previous_counts:
+                    termination = "exhausted"
+                previous_counts = counts if all(idle) else None
+
+        stop.value = 1
+        elapsed = time.time() - started
+
+        reports = {}
+        deadline = time.time() + 5
+        while len(reports) < n and time.time() < deadline:
+            try:
+                kind, payload = results.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                break
+            if kind == "report":
+                reports[payload["rank"]] = payload
+            elif kind == "solution" and solution_grid is None:
+                solution_grid = payload
+        for process in processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+
+        total_expansions = sum(expansions)
+        self.complexity_tracker.increment_operations(total_expansions)
+        self.hda_stats = {
+            "workers": n,
+            "termination": termination,
+            "expansions": total_expansions,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "expansions_per_second": round(total_expansions / elapsed, 2) if elapsed else 0.0,
+            "per_worker": [
+                {key: value for key, value in reports[rank].items() if key != "best"}
+                for rank in sorted(reports)
+            ]
+        }
+
+        if solution_grid is not None:
+            self._load_grid(solution_grid)
+            return self._create_hda_result(True, len(self.slots))
+
+        # Each worker reports its fullest fill; the fullest of those is the best partial answer.
+        best = max((report["best"] for report in reports.values() if report["best"]), key=lambda best: best[:2], default=None)
+        if best is None:
+            return self._create_hda_result(False, 0)
+        self._load_grid(best[2])
+        return self._create_hda_result(False, self._count_filled_words())
+
+    def _create_hda_result(self, success: bool, words_placed: int) -> Dict:
+        result = self._create_result(success, words_placed, len(self.slots))
+        result["hda_stats"] = self.hda_stats
+        return result
+
+    def _load_grid(self, grid_str: str):
+        for y, row in enumerate(self.solution):
+            row[:] = list(grid_str[y * self.width:(y + 1) * self.width])
+
+    def _count_filled_words(self) -> int:
+        filled = 0
+        for slot in self.slots:
+            if slot['direction'] == 'across':
+                cells = [self.solution[slot['y']][slot['x'] + i] for i in range(slot['length'])]
+            else:
+                cells = [self.solution[slot['y'] + i][slot['x']] for i in range(slot['length'])]
+            if '.' not in cells:
+                filled += 1
+        return filled
+
+
+def _fork_context():
+    # Forked workers share the loaded dictionary instead of receiving a pickled copy.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+def _owner(grid: List[List[str]], slot_index: int, workers: int) -> int:
+    key = ''.join(''.join(row) for row in grid) + f"|{slot_index}"
+    return zlib.crc32(key.encode()) % workers
+
+def _encode(state: AStarState) -> Tuple:
+    return (''.join(''.join(row) for row in state.grid), state.slot_index, state.cost,
+            state.heuristic, state.word_score)
+
+def _decode(message: Tuple, width: int, order: List[Dict]) -> AStarState:
+    grid_str, slot_index, cost, heuristic, word_score = message
+    grid = [list(grid_str[y:y + width]) for y in range(0, len(grid_str), width)]
+    state = AStarState(
+        grid=grid,
+        filled_slots={(slot['number'], slot['direction']) for slot in order[:slot_index]},
+        cost=cost,
+        slot_index=slot_index
+    )
+    state.heuristic = heuristic
+    state.word_score = word_score
+    state.priority = cost + heuristic
+    return state
+
+def _hda_worker(rank: int, workers: int, grid: List[List[str]], clues: Dict[str, List[Dict]], dict_helper,
+                inboxes, results, stop, idle, sent, received, expansions):
+    solver = AStarSolver(grid, clues, dict_helper)
+    solver._resolve_slot_clues()
+    order = solver.slot_ordering
+    width = solver.width
+
+    initial = AStarState(grid=solver.solution, filled_slots=set(), cost=0, slot_index=0)
+    if solver._calculate_heuristic(initial) == math.inf:
+        # Same fallback as the serial solver: search for the best partial fill instead of pruning.
+        solver._prune_dead_ends = False
+
+    inbox = inboxes[rank]
+    open_set: List[AStarState] = []
+    best_cost: Dict[str, int] = {}
+    closed = set()
+    outboxes = [[] for _ in range(workers)]
+    stats = {"rank": rank, "expanded": 0, "generated": 0, "duplicates": 0,
+             "batches_sent": 0, "batches_received": 0}
+    # (slots filled, slots assigned, grid) of the fullest state this worker has expanded.
+    fullest = (0, 0, None)
+
+    def offer(state: AStarState):
+        if state.grid_hash in closed or best_cost.get(state.grid_hash, math.inf) <= state.cost:
+            stats["duplicates"] += 1
+            return
+        best_cost[state.grid_hash] = state.cost
+        heapq.heappush(open_set, state)
+
+    def receive(batch):
+        idle[rank] = 0
+        received[rank] += 1
+        stats["batches_received"] += 1
+        for message in batch:
+            offer(_decode(message, width, order))
+
+    def flush(force: bool):
+        for owner, batch in enumerate(outboxes):
+            if batch and (force or len(batch) >= HDAStarSolver.BATCH_SIZE):
+                sent[rank] += 1
+                stats["batches_sent"] += 1
+                inboxes[owner].put(batch)
+                outboxes[owner] = []
+
+    try:
+        while not stop.value:
+            while True:
+                try:
+                    receive(inbox.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not open_set:
+                flush(True)
+                idle[rank] = 1
+                try:
+                    receive(inbox.get(timeout=HDAStarSolver.POLL_INTERVAL))
+                except queue.Empty:
+                    pass
+                continue
+
+            state = heapq.heappop(open_set)
+            if state.grid_hash in closed:
+                continue
+            closed.add(state.grid_hash)
+            filled = solver._count_filled_slots(state.grid)
+            if (filled, state.slot_index) > fullest[:2]:
+                fullest = (filled, state.slot_index, _encode(state)[0])
+
+            if state.slot_index >= len(order):
+                results.put(("solution", _encode(state)[0]))
+                stop.value = 1
+                break
+
+            for successor in solver._get_successors(state, order):
+                stats["generated"] += 1
+                solver._record_fill(successor.slot_index, successor.grid)
+                owner = _owner(successor.grid, successor.slot_index, workers)
+                if owner == rank:
+                    offer(successor)
+                else:
+                    outboxes[owner].append(_encode(successor))
+
+            stats["expanded"] += 1
+            expansions[rank] += 1
+            flush(stats["expanded"] % HDAStarSolver.FLUSH_INTERVAL == 0 or not open_set)
+    finally:
+        # Same anytime answer as the serial solvers: the deepest fill recorded, unless an expanded
+        # state has more slots filled through its crossings.
+        depth, best_grid = solver._best_fill
+        if best_grid:
+            fullest = max(fullest, (solver._count_filled_slots(best_grid), depth,
+                                    ''.join(''.join(row) for row in best_grid)), key=lambda best: best[:2])
+        stats["best"] = fullest if fullest[2] else None
+        results.put(("report", stats))
+        for other in inboxes:
+            other.cancel_join_thread()
@@ -1,13 +1,23 @@
-import heapq
+import time
 from typing import List, Dict, Set, Tuple, Optional
 from ..core.base_solver import BaseCrosswordSolver
+from ..core.beam import BoundedBeam
 from ..core.slot_manager import SlotManager
 from ..core.constraints import ConstraintChecker
 
 class HybridSolver(BaseCrosswordSolver):
+    STALL_EXPANSIONS_PER_WIDTH = 4
+    DEAD_END_STREAK_TO_WIDEN = 2
+    LOW_BRANCHING_FACTOR = 1.5
+    CANDIDATE_COLLAPSE = 1.0
+    WARMUP_EXPANSIONS = 10
+    MAX_LOGGED_DECISIONS = 50
+
     def __init__(self, grid: List[List[str]], clues: Dict[str, List[Dict]], dict_helper, 
                  enable_memory_profiling: bool = False, beam_width: int = 5, 
-                 switch_threshold: float = 0.7):
+                 switch_threshold: float = 0.7, beam_diversity: int = 0, adaptive: bool = True,
+                 min_beam_width: int = 2, max_beam_width: int = 20, max_expansions: Optional[int] = None,
+                 beam_time_budget: Optional[float] = None):
         super().__init__(grid, clues, enable_memory_profiling)
         self.dict_helper = dict_helper
         self.slot_manager = SlotManager(self.solution, clues)
@@ -17,11 +27,24 @@ class HybridSolver(BaseCrosswordSolver):
         
         self.beam_width = beam_width
         self.switch_threshold = switch_threshold
-        self.state_cache = {}
+        self.beam_diversity = beam_diversity
+        self.adaptive = adaptive
+        self.min_beam_width = max(1, min(min_beam_width, beam_width))
+        self.max_beam_width = max(max_beam_width, beam_width)
+        self.max_expansions = max_expansions
+        self.beam_time_budget = beam_time_budget
+        self.beam_stats = {}
         
         self.astar_expansions = 0
         self.dfs_backtracks = 0
         self.mode_switches = 0
+        
+        self.branching_factor = None
+        self.candidate_count = None
+        self.phase_decisions = []
+        self.phase_times = {}
+        self._dfs_base_depth = 0
+        self._phase_start = 0.0
 
     def solve(self) -> Dict:
         self._start_performance_tracking()
@@ -29,29 +52,59 @@ class HybridSolver(BaseCrosswordSolver):
         if not self.slots:
             return self._create_result(True, 0, 0)
         
+        self._resolve_slot_clues()
+        if self.stopped:
+            return self._create_hybrid_result(False, self._count_filled_words())
+        self._phase_start = time.time()
+        self.phase = "beam"
         success, filled_slots = self._explore_with_astar()
+        self.phase_times["beam"] = time.time() - self._phase_start
         
         if success:
             words_placed = self._count_filled_words()
-            return self._create_result(True, words_placed, len(self.slots))
+            return self._create_hybrid_result(True, words_placed)
+        
+        if self.stopped:
+            return self._create_hybrid_result(False, self._count_filled_words())
         
         self.mode_switches += 1
+        self.phase = "dfs"
+        self.search_grid = self.solution
         
+        dfs_start = time.time()
         success = self._complete_with_dfs(filled_slots)
+        self.phase_times["dfs"] = time.time() - dfs_start
         
         words_placed = self._count_filled_words()
-        return self._create_result(success, words_placed, len(self.slots))
+        return self._create_hybrid_result(success, words_placed)
+
+    def _create_hybrid_result(self, success: bool, words_placed: int) -> Dict:
+        result = self._create_result(success, words_placed, len(self.slots))
+        result["beam_stats"] = {
+            **self.beam_stats,
+            "expansions": self.astar_expansions,
+            "dfs_backtracks": self.dfs_backtracks
+        }
+        result["phase_report"] = {
+            "adaptive": self.adaptive,
+            "initial_beam_width": self.beam_width,
+            "final_beam_width": self.beam_stats.get("capacity", self.beam_width),
+            "switch_threshold": self.switch_threshold,
+            "branching_factor": round(self.branching_factor or 0.0, 3),
+            "candidate_count": round(self.candidate_count or 0.0, 3),
+            "phase_times_ms": {phase: round(seconds * 1000, 2) for phase, seconds in self.phase_times.items()},
+            "decisions": self.phase_decisions
+        }
+        return result
 
     def _explore_with_astar(self) -> Tuple[bool, Set[Tuple[int, str]]]:
         if self.enable_memory_profiling:
             self._record_memory_snapshot("astar_start")
         
         processing_order = self._order_slots_by_difficulty()
-        initial_filled = set()
         
         initial_state = SolverState(
             grid=[row[:] for row in self.solution],
-            filled_slots=initial_filled,
             cost=0,
             slot_index=0,
             processing_order=processing_order
@@ -59,40 +112,118 @@ class HybridSolver(BaseCrosswordSolver):
         initial_state.heuristic = self._estimate_remaining_difficulty(initial_state)
         initial_state.priority = initial_state.cost + initial_state.heuristic
         
-        beam = [initial_state]
+        beam = BoundedBeam(self.beam_width, min_diversity=self.beam_diversity)
+        beam.push(initial_state)
         best_state = initial_state
         
-        max_expansions = min(1000, len(self.slots) * 50)
+        max_expansions = self.max_expansions or min(1000, len(self.slots) * 50)
+        expansions_since_progress = 0
+        dead_end_streak = 0
         
-        while beam and self.astar_expansions < max_expansions:
-            self.astar_expansions += 1
-            
-            current_state = heapq.heappop(beam)
-            
-            if current_state.slot_index >= len(processing_order):
-                self._apply_state_to_solution(current_state)
-                return True, current_state.filled_slots
-            
-            if len(current_state.filled_slots) > len(best_state.filled_slots):
-                best_state = current_state
-            
-            successors = self._generate_successors(current_state)
-            
-            for successor in successors:
-                heapq.heappush(beam, successor)
-            
-            if len(beam) > self.beam_width:
-                beam = heapq.nsmallest(self.beam_width, beam)
-                heapq.heapify(beam)
+        try:
+            while beam and self.astar_expansions < max_expansions:
+                if self._should_stop():
+                    self._record_decision("stop", "stop_requested", best_state, beam)
+                    break
+                self.astar_expansions += 1
+                
+                current_state = beam.pop()
+                self.search_grid = current_state.grid
+                
+                if current_state.slot_index >= len(processing_order):
+                    self._apply_state_to_solution(current_state)
+                    return True, current_state.filled_slots
+                
+                if current_state.slot_index > best_state.slot_index:
+                    best_state = current_state
+                    expansions_since_progress = 0
+                else:
+                    expansions_since_progress += 1
+                
+                successors = self._generate_successors(current_state)
+                for successor in successors:
+                    beam.push(successor)
+                    self._record_fill(successor.slot_index, successor.grid)
+                
+                self._observe_expansion(len(successors))
+                self.complexity_tracker.increment_operations()
+                dead_end_streak = 0 if successors else dead_end_streak + 1
+                
+                progress_ratio = current_state.slot_index / len(self.slots)
+                reason = self._switch_reason(progress_ratio, beam, expansions_since_progress)
+                if reason:
+                    self._record_decision("switch_to_dfs", reason, best_state, beam)
+                    self._apply_state_to_solution(best_state)
+                    return False, best_state.filled_slots
+                
+                if self.adaptive:
+                    self._adapt_beam_width(beam, dead_end_streak, best_state)
             
-            progress_ratio = len(current_state.filled_slots) / len(self.slots)
-            if progress_ratio > self.switch_threshold and len(beam) == 1:
-                self._apply_state_to_solution(best_state)
-                return False, best_state.filled_slots
+            if not self.stopped:
+                reason = "beam_exhausted" if not beam else "max_expansions"
+                self._record_decision("switch_to_dfs", reason, best_state, beam)
+        finally:
+            self.beam_stats = beam.stats()
         
         self._apply_state_to_solution(best_state)
         return False, best_state.filled_slots
 
+    def _observe_expansion(self, successor_count: int):
+        if self.branching_factor is None:
+            self.branching_factor = float(successor_count)
+        else:
+            self.branching_factor = 0.7 * self.branching_factor + 0.3 * successor_count
+
+    def _switch_reason(self, progress_ratio: float, beam: BoundedBeam, expansions_since_progress: int) -> Optional[str]:
+        if progress_ratio > self.switch_threshold and len(beam) == 1:
+            return "beam_converged"
+        
+        if not self.adaptive:
+            return None
+        
+        if (self.candidate_count is not None and self.candidate_count <= self.CANDIDATE_COLLAPSE
+                and progress_ratio > self.switch_threshold / 2):
+            return "candidate_collapse"
+        
+        if expansions_since_progress >= self.STALL_EXPANSIONS_PER_WIDTH * beam.capacity:
+            return "stalled"
+        
+        if self.beam_time_budget is not None and time.time() - self._phase_start > self.beam_time_budget:
+            return "beam_time_budget"
+        
+        return None
+
+    def _adapt_beam_width(self, beam: BoundedBeam, dead_end_streak: int, best_state: 'SolverState'):
+        width = beam.capacity
+        
+        if dead_end_streak >= self.DEAD_END_STREAK_TO_WIDEN and width < self.max_beam_width:
+            beam.resize(min(self.max_beam_width, width * 2))
+            self._record_decision("widen_beam", "dead_ends", best_state, beam)
+        elif (dead_end_streak == 0 and self.astar_expansions >= self.WARMUP_EXPANSIONS
+                and self.branching_factor < self.LOW_BRANCHING_FACTOR and width > self.min_beam_width):
+            beam.resize(max(self.min_beam_width, width - 1))
+            self._record_decision("narrow_beam", "low_branching", best_state, beam)
+
+    def _observe_candidates(self, count: int):
+        if self.candidate_count is None:
+            self.candidate_count = float(count)
+        else:
+            self.candidate_count = 0.7 * self.candidate_count + 0.3 * count
+
+    def _record_decision(self, action: str, reason: str, best_state: 'SolverState', beam: BoundedBeam):
+        if len(self.phase_decisions) >= self.MAX_LOGGED_DECISIONS:
+            return
+        self.phase_decisions.append({
+            "action": action,
+            "reason": reason,
+            "expansion": self.astar_expansions,
+            "slots_filled": best_state.slot_index,
+            "beam_width": beam.capacity,
+            "branching_factor": round(self.branching_factor or 0.0, 3),
+            "candidate_count": round(self.candidate_count or 0.0, 3),
+            "elapsed_ms": round((time.time() - self._phase_start) * 1000, 2)
+        })
+
     def _complete_with_dfs(self, initial_filled: Set[Tuple[int, str]]) -> bool:
         if self.enable_memory_profiling:
             self._record_memory_snapshot("dfs_start")
@@ -105,6 +236,7 @@ class HybridSolver(BaseCrosswordSolver):
         
         ordered_slots = self._sort_remaining_slots(remaining_slots)
         slot_indices = self._convert_slots_to_indices(ordered_slots)
+        self._dfs_base_depth = len(initial_filled)
         
         success = self._guided_dfs(0, slot_indices, ordered_slots)
         return success
@@ -117,26 +249,26 @@ class HybridSolver(BaseCrosswordSolver):
         
         slot = state.processing_order[state.slot_index]
         candidates = self._evaluate_candidates_with_fallback(slot, state.grid)
+        self._observe_candidates(len(candidates))
         
         if not candidates:
             return []
             
         max_candidates = min(15, len(candidates))
         
-        for word, score in candidates[:max_candidates]:
+        for word, score in sorted(candidates, key=lambda x: -x[1])[:max_candidates]:
             if not self._validate_word_placement(slot, word, state.grid):
                 continue
 
-            new_grid = self._apply_word_to_grid(state.grid, slot, word)
-            new_filled = state.filled_slots | {(slot['number'], slot['direction'])}
-            
             new_state = SolverState(
-                grid=new_grid,
-                filled_slots=new_filled,
+                grid=self._apply_word_to_grid(state.grid, slot, word),
                 cost=state.cost + 1,
                 slot_index=state.slot_index + 1,
-                processing_order=state.processing_order
+                processing_order=state.processing_order,
+                parent=state,
+                word=word
             )
+            new_state.word_score = score
             
             new_state.heuristic = self._estimate_remaining_difficulty(new_state)
             new_state.priority = new_state.cost + new_state.heuristic
@@ -158,9 +290,10 @@ class HybridSolver(BaseCrosswordSolver):
             self.dfs_backtracks += 1
             return False
         
-        candidates.sort(key=lambda x: -x[1])
-        
-        for word, score in candidates:
+        for word, score in sorted(candidates, key=lambda x: -x[1]):
+            if self._should_stop():
+                return False
+            
             if not self._fits(slot, word):
                 continue
             
@@ -171,6 +304,7 @@ class HybridSolver(BaseCrosswordSolver):
                 self.dfs_backtracks += 1
                 continue
             
+            self._record_fill(self._dfs_base_depth + slot_idx + 1, self.solution)
             if self._guided_dfs(slot_idx + 1, slot_indices, ordered_slots):
                 return True
             
@@ -180,13 +314,18 @@ class HybridSolver(BaseCrosswordSolver):
         return False
 
     def _evaluate_candidates_with_fallback(self, slot: Dict, grid: List[List[str]]) -> List[Tuple[str, int]]:
+        slot_id = (slot['number'], slot['direction'])
+        pattern = self._extract_pattern(slot, grid)
+        cached = self.candidate_cache.get(slot_id, pattern)
+        if cached is not None:
+            return cached
+        
         candidates = self._evaluate_candidates(slot, grid)
         
         if candidates:
-            return candidates
+            return self.candidate_cache.put(slot_id, pattern, candidates)
         
         fallback_candidates = []
-        pattern = self._extract_pattern(slot, grid)
         
         fallback_methods = [
             self._fallback_by_pattern_only,
@@ -212,9 +351,9 @@ class HybridSolver(BaseCrosswordSolver):
                 score = self._compute_word_score(slot, word, grid, pattern)
                 scored_fallback.append((word, score))
             scored_fallback.sort(key=lambda x: -x[1])
-            return scored_fallback[:20]
+            return self.candidate_cache.put(slot_id, pattern, scored_fallback[:20])
         
-        return []
+        return self.candidate_cache.put(slot_id, pattern, [])
 
     def _fallback_by_pattern_only(self, slot: Dict, pattern: str, grid: List[List[str]]) -> List[str]:
         candidates = []
@@ -233,7 +372,7 @@ class HybridSolver(BaseCrosswordSolver):
     def _fallback_by_length_only(self, slot: Dict, pattern: str, grid: List[List[str]]) -> List[str]:
         candidates = []
         try:
-            length_words = self.dict_helper.get_words_by_length(slot['length'], max_words=100)
+            length_words = self._get_resolved_clue(slot).length_pool(100)
             for word_data in length_words:
                 word = self._parse_candidate_word(word_data)
                 if word and self._validate_word_placement(slot, word, grid):
@@ -245,14 +384,11 @@ class HybridSolver(BaseCrosswordSolver):
     def _fallback_by_alternative_spellings(self, slot: Dict, pattern: str, grid: List[List[str]]) -> List[str]:
         candidates = []
         try:
-            if hasattr(self.dict_helper, 'get_alternative_spellings'):
-                alt_words = self.dict_helper.get_alternative_spellings(
-                    slot['clue'], slot['length'], max_words=30
-                )
-                for word_data in alt_words:
-                    word = self._parse_candidate_word(word_data)
-                    if word and len(word) == slot['length'] and self._validate_word_placement(slot, word, grid):
-                        candidates.append(word)
+            alt_words = self._get_resolved_clue(slot).alternative_spellings(max_words=30, should_stop=self._should_stop)
+            for word_data in alt_words:
+                word = self._parse_candidate_word(word_data)
+                if word and len(word) == slot['length'] and self._validate_word_placement(slot, word, grid):
+                    candidates.append(word)
         except Exception:
             pass
         return candidates
@@ -260,10 +396,9 @@ class HybridSolver(BaseCrosswordSolver):
     def _fallback_by_common_words(self, slot: Dict, pattern: str, grid: List[List[str]]) -> List[str]:
         candidates = []
         try:
-            common_words = self.dict_helper.get_words_by_length(slot['length'], max_words=50)
-            common_words.sort(key=lambda x: x.get('score', 0), reverse=True)
+            common_words = self._get_resolved_clue(slot).length_pool(50)
             
-            for word_data in common_words[:20]:
+            for word_data in sorted(common_words, key=lambda x: x.get('score', 0), reverse=True)[:20]:
                 word = self._parse_candidate_word(word_data)
                 if word and self._validate_word_placement(slot, word, grid):
                     candidates.append(word)
@@ -355,8 +490,7 @@ class HybridSolver(BaseCrosswordSolver):
                         else:
                             score -= 5
         
-        exact_match = self.dict_helper.find_word_by_exact_clue(slot['clue'])
-        if exact_match and exact_match['word'].upper() == word:
+        if self._get_resolved_clue(slot).exact_word == word:
             score += 5
         
         return max(0, score)
@@ -408,12 +542,19 @@ class HybridSolver(BaseCrosswordSolver):
         return True
 
     def _apply_word_to_grid(self, grid: List[List[str]], slot: Dict, word: str) -> List[List[str]]:
-        new_grid = [row[:] for row in grid]
-        for i, char in enumerate(word):
-            if slot['direction'] == 'across':
-                new_grid[slot['y']][slot['x'] + i] = char
-            else:
-                new_grid[slot['y'] + i][slot['x']] = char
+        # Copy-on-write: only the rows the word touches are copied, every other
+        # row object is shared with the parent state's grid.
+        new_grid = list(grid)
+        x, y = slot['x'], slot['y']
+        if slot['direction'] == 'across':
+            row = grid[y][:]
+            row[x:x + len(word)] = word
+            new_grid[y] = row
+        else:
+            for i, char in enumerate(word):
+                row = grid[y + i][:]
+                row[x] = char
+                new_grid[y + i] = row
         return new_grid
 
     def _extract_pattern(self, slot: Dict, grid: List[List[str]]) -> str:
@@ -427,13 +568,7 @@ class HybridSolver(BaseCrosswordSolver):
         return ''.join(pattern)
 
     def _predict_candidate_count(self, slot: Dict) -> int:
-        try:
-            words = self.dict_helper.get_possible_words(
-                clue=slot['clue'], max_words=50, length_range=(slot['length'], slot['length'])
-            )
-            return len(words)
-        except:
-            return 10
+        return len(self._get_resolved_clue(slot).clue_matches(50))
 
     def _locate_slot(self, slot_key: Tuple[int, str]) -> Optional[Dict]:  
         for slot in self.slots:
@@ -449,12 +584,7 @@ class HybridSolver(BaseCrosswordSolver):
         return None
 
     def _fetch_dictionary_candidates(self, slot: Dict) -> List:
-        try:
-            return self.dict_helper.get_possible_words(
-                clue=slot['clue'], max_words=200, length_range=(slot['length'], slot['length'])
-            )
-        except:
-            return []
+        return self._get_resolved_clue(slot).clue_matches(200)
 
     def _count_filled_words(self) -> int:
         filled = 0
@@ -500,23 +630,38 @@ class HybridSolver(BaseCrosswordSolver):
         self.complexity_tracker.increment_operations(len(positions))
 
 class SolverState:
-    __slots__ = ('grid', 'filled_slots', 'cost', 'slot_index', 'processing_order', 'heuristic', 'priority')
+    __slots__ = ('grid', 'cost', 'slot_index', 'processing_order', 'heuristic', 'priority',
+                 'word_score', 'parent', 'word', 'key')
     
-    def __init__(self, grid: List[List[str]], filled_slots: Set[Tuple[int, str]], 
-                 cost: int, slot_index: int, processing_order: List[Dict]):
+    def __init__(self, grid: List[List[str]], cost: int, slot_index: int, processing_order: List[Dict],
+                 parent: Optional['SolverState'] = None, word: Optional[str] = None):
         self.grid = grid
-        self.filled_slots = filled_slots
         self.cost = cost
         self.slot_index = slot_index
         self.processing_order = processing_order
         self.heuristic = 0
         self.priority = 0
+        self.word_score = 0
+        self.parent = parent
+        self.word = word
+        # The words placed so far: the processing order is fixed, so they determine the fill, and
+        # unlike the grid they differ after placing a word the crossings already spell. Extending
+        # the parent's key costs O(depth) per successor rather than a pass over the whole grid.
+        self.key = parent.key + (word,) if parent is not None else ()
+    
+    @property
+    def filled_slots(self) -> Set[Tuple[int, str]]:
+        return {(slot['number'], slot['direction']) for slot in self.processing_order[:self.slot_index]}
+    
+    def assignment(self) -> Tuple[str, ...]:
+        """Words placed so far, in processing order."""
+        return self.key
     
     def __lt__(self, other):
         return self.priority < other.priority
 
 def solve_with_hybrid(grid: List[List[str]], clues: Dict[str, List[Dict]], 
-                      beam_width: int = 5, switch_threshold: float = 0.7) -> Dict:
+                      beam_width: int = 5, switch_threshold: float = 0.7, beam_diversity: int = 0) -> Dict:
     from dictionary_helper import DictionaryHelper
     import os
     
@@ -525,5 +670,5 @@ def solve_with_hybrid(grid: List[List[str]], clues: Dict[str, List[Dict]],
     dict_helper = DictionaryHelper(dict_path)
     
     solver = HybridSolver(grid, clues, dict_helper, beam_width=beam_width, 
-                          switch_threshold=switch_threshold)
+                          switch_threshold=switch_threshold, beam_diversity=beam_diversity)
     return solver.solve()
\ No newline at end of file
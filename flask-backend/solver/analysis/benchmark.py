@@ -0,0 +1,95 @@
+"""Compare the expansion rate of serial A* with hash-distributed A*.
+
+Run from flask-backend:
+
+    python -m solver.analysis.benchmark --sizes 15 17 21 --workers 1 2 4 8
+
+Puzzles are generated from fixed seeds so runs are comparable across machines.
+`--clue-words N` keeps only the first N words of each clue, which makes the
+search branch instead of following exact clue matches.
+"""
+import argparse
+import json
+import logging
+import random
+import time
+from typing import Dict, List
+
+from generator.crossword_generator import CrosswordGenerator, dict_helper
+from solver.algorithms.astar_solver import AStarSolver
+from solver.algorithms.hda_star_solver import HDAStarSolver
+
+def generate_puzzle(size: int, seed: int, clue_words: int = 0):
+    random.seed(seed)
+    word_list = []
+    for length in range(3, min(10, size) + 1):
+        word_list.extend(dict_helper.get_words_by_length(length, max_words=15 + random.randint(0, 20)))
+    random.shuffle(word_list)
+    initial_word = random.choice(dict_helper.get_words_by_length(5, max_words=100))['word']
+    puzzle = CrosswordGenerator(size, size).generate(initial_word=initial_word, word_list=word_list, max_attempts=2)
+
+    clues = puzzle.get_clues()
+    if clue_words:
+        for direction_clues in clues.values():
+            for clue in direction_clues:
+                clue['clue'] = ' '.join(clue['clue'].split()[:clue_words])
+    grid = [['.' for _ in row] for row in puzzle.grid]
+    return grid, clues
+
+def _run(solver) -> Dict:
+    started = time.time()
+    result = solver.solve()
+    elapsed = time.time() - started
+    expansions = result["time_complexity"]["operations"]
+    return {
+        "status": result["status"],
+        "words_placed": result["words_placed"],
+        "total_words": result["total_words"],
+        "expansions": expansions,
+        "seconds": round(elapsed, 3),
+        "expansions_per_second": round(expansions / elapsed, 1) if elapsed else 0.0
+    }
+
+def run_benchmark(sizes: List[int], workers: List[int], seeds: int, clue_words: int) -> List[Dict]:
+    rows = []
+    for size in sizes:
+        for seed in range(seeds):
+            grid, clues = generate_puzzle(size, seed, clue_words)
+            rows.append({"size": size, "seed": seed, "solver": "A*", "workers": 1,
+                         **_run(AStarSolver(grid, clues, dict_helper))})
+            for count in workers:
+                rows.append({"size": size, "seed": seed, "solver": "HDA*", "workers": count,
+                             **_run(HDAStarSolver(grid, clues, dict_helper, workers=count))})
+    return rows
+
+def print_table(rows: List[Dict]):
+    print(f"{'size':>4} {'seed':>4} {'solver':>6} {'workers':>7} {'status':>8} {'words':>7} "
+          f"{'expansions':>10} {'seconds':>8} {'exp/s':>9} {'vs A*':>6}")
+    serial_rate = {}
+    for row in rows:
+        key = (row["size"], row["seed"])
+        if row["solver"] == "A*":
+            serial_rate[key] = row["expansions_per_second"]
+        ratio = row["expansions_per_second"] / serial_rate[key] if serial_rate.get(key) else 0.0
+        print(f"{row['size']:>4} {row['seed']:>4} {row['solver']:>6} {row['workers']:>7} {row['status']:>8} "
+              f"{row['words_placed']:>3}/{row['total_words']:<3} {row['expansions']:>10} {row['seconds']:>8} "
+              f"{row['expansions_per_second']:>9} {ratio:>5.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[15, 17, 21])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seeds", type=int, default=2)
+    parser.add_argument("--clue-words", type=int, default=1)
+    parser.add_argument("--json", help="also write the rows to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rows = run_benchmark(args.sizes, args.workers, args.seeds, args.clue_words)
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
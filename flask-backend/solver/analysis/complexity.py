@@ -2,24 +2,40 @@ import time
 from typing import Dict, List, Any
 
 class ComplexityTracker:
+
+    MAX_HISTORY = 2000
     
     def __init__(self):
         self.operations_count = 0
         self.memory_usage = []
         self.start_time = 0
         self.operation_history = []
+        self.sample_every = 1
+        self._next_sample = 0
         
     def reset(self):
         """Reset all tracked metrics."""
         self.operations_count = 0
         self.memory_usage = []
         self.operation_history = []
+        self.sample_every = 1
+        self._next_sample = 0
         self.start_time = time.time()
         
     def increment_operations(self, count: int = 1):
-        """Increment the operation count."""
+        """Increment the operation count.
+
+        The history keeps at most MAX_HISTORY points: when it fills up, every
+        other point is dropped and later operations are sampled half as often.
+        """
         self.operations_count += count
+        if self.operations_count < self._next_sample:
+            return
         self.operation_history.append((time.time() - self.start_time, self.operations_count))
+        if len(self.operation_history) >= self.MAX_HISTORY:
+            self.operation_history = self.operation_history[1::2]
+            self.sample_every *= 2
+        self._next_sample = self.operations_count + self.sample_every
         
     def record_memory(self, memory_kb: int):
         """Record memory usage at this point in time."""
@@ -1,14 +1,19 @@
 import time
 import tracemalloc
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 import logging
+import psutil
 from ..analysis.complexity import ComplexityTracker
+from .candidate_cache import CandidateCache
+from .clue_resolution import ResolvedClue
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class BaseCrosswordSolver(ABC):
+
+    PROGRESS_INTERVAL = 0.5
     
     def __init__(self, grid: List[List[str]], clues: Dict[str, List[Dict]], enable_memory_profiling: bool = False):
         self.original_grid = [row[:] for row in grid]
@@ -23,22 +28,156 @@ class BaseCrosswordSolver(ABC):
         ]
         
         self.complexity_tracker = ComplexityTracker()
+        self.candidate_cache = CandidateCache()
+        self.slot_clues: Dict[tuple, ResolvedClue] = {}
         self.start_time = 0
         self._tracing = False
         self.memory_samples = []
         self.fallback_usage_count = 0
+        self.stop_check: Optional[Callable[[], bool]] = None
+        self.deadline: Optional[float] = None
+        self.stopped = False
+        self.stop_reason: Optional[str] = None
+        self.progress_callback: Optional[Callable[[Dict], None]] = None
+        self.progress_interval = self.PROGRESS_INTERVAL
+        # Best-first solvers point this at the state they are expanding; the others fill `solution` in place.
+        self.search_grid = self.solution
+        self.phase: Optional[str] = None
+        self._last_progress = (0.0, 0)
+        # (search depth, grid copy) of the fullest assignment so far, for anytime results.
+        self._best_fill = (0, None)
         
     @abstractmethod
     def solve(self) -> Dict:
         pass
         
+    def _resolve_slot_clues(self):
+        """Look every slot's clue up in the dictionary once, before the search starts.
+
+        Stops early when the solver is stopped; clues left out are resolved on first use.
+        """
+        self.slot_clues = {}
+        for slot in self.slots:
+            if self._should_stop():
+                return
+            self.slot_clues[(slot['number'], slot['direction'])] = ResolvedClue(slot, self.dict_helper)
+
+    def _get_resolved_clue(self, slot: Dict) -> ResolvedClue:
+        slot_id = (slot['number'], slot['direction'])
+        resolved = self.slot_clues.get(slot_id)
+        if resolved is None:
+            resolved = self.slot_clues[slot_id] = ResolvedClue(slot, self.dict_helper)
+        return resolved
+        
+    def set_time_limit(self, seconds: Optional[float]):
+        """Stop the search `seconds` from now with status "timeout"; None removes the limit."""
+        self.deadline = time.time() + seconds if seconds else None
+
+    def _should_stop(self) -> bool:
+        """Poll the deadline and the stop hook; once one fires, the
+        search unwinds and reports what it has.
+
+        Every solver calls this once per search step, so it also drives the
+        throttled progress callback.
+        """
+        if self.progress_callback is not None and time.time() - self._last_progress[0] >= self.progress_interval:
+            self.progress_callback(self.progress_snapshot())
+        if self.stopped:
+            return True
+
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.stop_reason = "timeout"
+        elif self.stop_check is not None and self.stop_check():
+            self.stop_reason = "cancelled"
+        self.stopped = self.stop_reason is not None
+        return self.stopped
+        
+    def progress_snapshot(self) -> Dict:
+        """Where the search is now: slots filled, the fullest grid seen so far, speed and memory."""
+        now = time.time()
+        operations = self.complexity_tracker.operations_count
+        last_time, last_operations = self._last_progress
+        self._last_progress = (now, operations)
+
+        slots_filled = self._count_filled_slots(self.search_grid)
+        best_grid = self._best_fill[1]
+        best_slots_filled = self._count_filled_slots(best_grid) if best_grid else 0
+        if slots_filled >= best_slots_filled:
+            best_grid, best_slots_filled = [row[:] for row in self.search_grid], slots_filled
+
+        if self._tracing:
+            memory_kb = tracemalloc.get_traced_memory()[0] / 1024.0
+        else:
+            memory_kb = psutil.Process().memory_info().rss / 1024.0
+
+        elapsed = now - self.start_time
+        interval = now - last_time if last_time else elapsed
+        return {
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "phase": self.phase,
+            "operations": operations,
+            "operations_per_second": round((operations - last_operations) / interval, 1) if interval > 0 else 0.0,
+            "slots_filled": slots_filled,
+            "best_slots_filled": best_slots_filled,
+            "total_slots": len(self.slots),
+            "best_grid": best_grid,
+            "memory_kb": round(memory_kb, 2)
+        }
+
+    def _record_fill(self, depth: int, grid: List[List[str]]):
+        """Keep a copy of `grid` if the search has never had `depth` slots assigned;
+        O(1) unless it is an improvement."""
+        if depth > self._best_fill[0]:
+            self._best_fill = (depth, [row[:] for row in grid])
+
+    def _restore_best_fill(self, words_placed: int) -> int:
+        """Put the fullest recorded fill back into `solution` if it beats the current one."""
+        best_grid = self._best_fill[1]
+        if best_grid is None:
+            return words_placed
+        best_words = self._count_filled_slots(best_grid)
+        if best_words <= words_placed:
+            return words_placed
+        for row, best_row in zip(self.solution, best_grid):
+            row[:] = best_row
+        return best_words
+
+    def _fill_quality(self, words_placed: int, total_words: int) -> Dict:
+        cells = set()
+        for slot in self.slots:
+            for i in range(slot['length']):
+                cells.add((slot['x'] + i, slot['y']) if slot['direction'] == 'across' else (slot['x'], slot['y'] + i))
+        cells_filled = sum(1 for x, y in cells if self.solution[y][x] != '.')
+        return {
+            "slots_filled": words_placed,
+            "total_slots": total_words,
+            "fill_ratio": round(words_placed / total_words, 4) if total_words else 1.0,
+            "cells_filled": cells_filled,
+            "total_cells": len(cells),
+            "cell_ratio": round(cells_filled / len(cells), 4) if cells else 1.0
+        }
+
+    def _count_filled_slots(self, grid: List[List[str]]) -> int:
+        filled = 0
+        for slot in self.slots:
+            if slot['direction'] == 'across':
+                cells = grid[slot['y']][slot['x']:slot['x'] + slot['length']]
+            else:
+                cells = [grid[slot['y'] + i][slot['x']] for i in range(slot['length'])]
+            if '.' not in cells:
+                filled += 1
+        return filled
+
     def _start_performance_tracking(self):
         self.start_time = time.time()
+        self._last_progress = (0.0, 0)
+        self._best_fill = (0, None)
         if self.enable_memory_profiling:
             tracemalloc.start()
             self._tracing = True
         self.memory_samples.clear()
         self.complexity_tracker.reset()
+        self.candidate_cache.reset()
         self._record_memory_snapshot("start")
 
     def _record_memory_snapshot(self, label: str = ""):
@@ -81,10 +220,14 @@ class BaseCrosswordSolver(ABC):
             "peak_memory_kb": peak_memory_kb,
             "time_complexity": self.complexity_tracker.time_complexity(),
             "space_complexity": self.complexity_tracker.space_complexity(),
-            "fallback_usage_count": self.fallback_usage_count
+            "fallback_usage_count": self.fallback_usage_count,
+            "candidate_cache": self.candidate_cache.stats()
         }
         
     def _create_result(self, success: bool, words_placed: int, total_words: int) -> Dict:
+        """Package the solve; an unsolved puzzle reports the fullest fill the search reached."""
+        if not success:
+            words_placed = self._restore_best_fill(words_placed)
         metrics = self._stop_performance_tracking()
         
         formatted_solution = []
@@ -95,7 +238,7 @@ class BaseCrosswordSolver(ABC):
             formatted_solution.append(formatted_row)
         
         return {
-            "status": "success" if success else "partial",
+            "status": "success" if success else "timeout" if self.stop_reason == "timeout" else "partial",
             "grid": formatted_solution,
             "min_memory_kb": metrics["min_memory_kb"],
             "memory_usage_kb": metrics["avg_memory_kb"],
@@ -105,6 +248,10 @@ class BaseCrosswordSolver(ABC):
             "space_complexity": metrics["space_complexity"],
             "words_placed": words_placed,
             "total_words": total_words,
+            "quality": self._fill_quality(words_placed, total_words),
             "fallback_usage_count": metrics["fallback_usage_count"],
-            "memory_profiling_enabled": self.enable_memory_profiling
+            "candidate_cache": metrics["candidate_cache"],
+            "memory_profiling_enabled": self.enable_memory_profiling,
+            "stopped": self.stopped,
+            "stop_reason": self.stop_reason
         }
\ No newline at end of file
@@ -0,0 +1,116 @@
+import bisect
+import itertools
+from typing import Dict, Hashable, List, Optional, Sequence
+
+class BoundedBeam:
+    """Fixed-capacity priority queue for beam search.
+
+    Holds at most `capacity` states, lowest priority first. Pushing into a full
+    beam either evicts the current worst state or is rejected outright, so every
+    operation costs O(capacity) however long the search has been running.
+
+    Ties on priority go to the state with the higher `word_score`.
+    States must expose `priority`, `word_score`, `key` (identifies the partial
+    fill, compared by equality, so a hash is not enough) and `assignment()` (the
+    words placed so far, in processing order). A state whose key matches one
+    still in the beam is dropped; keys are only kept for the states the beam
+    holds, so memory stays bounded by the capacity. With `min_diversity > 0`, a
+    state whose assignment differs from a kept state of the same depth in fewer
+    than `min_diversity` slots only survives if it beats that state.
+    """
+
+    def __init__(self, capacity: int, min_diversity: int = 0):
+        self.capacity = max(1, capacity)
+        self.min_diversity = max(0, min_diversity)
+        self._entries: List[tuple] = []
+        self._keys = set()
+        self._order = itertools.count()
+
+        self.pushed = 0
+        self.duplicates = 0
+        self.similar_rejected = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def push(self, state) -> bool:
+        """Offer a state to the beam; returns True if it was kept."""
+        if state.key in self._keys:
+            self.duplicates += 1
+            return False
+
+        rank = (state.priority, -state.word_score)
+        if len(self._entries) >= self.capacity and rank >= self._entries[-1][0]:
+            self.rejected += 1
+            return False
+
+        if self.min_diversity:
+            similar = self._find_similar(state)
+            if similar is not None:
+                if similar[0] <= rank:
+                    self.similar_rejected += 1
+                    return False
+                self._entries.remove(similar)
+                self._keys.discard(similar[2].key)
+                self.similar_rejected += 1
+
+        self._keys.add(state.key)
+        bisect.insort(self._entries, (rank, next(self._order), state))
+        self.pushed += 1
+
+        if len(self._entries) > self.capacity:
+            self._evict_worst()
+        return True
+
+    def pop(self):
+        """Remove and return the best state."""
+        state = self._entries.pop(0)[2]
+        self._keys.discard(state.key)
+        return state
+
+    def resize(self, capacity: int):
+        """Change the capacity, dropping the worst states if the beam shrinks."""
+        self.capacity = max(1, capacity)
+        while len(self._entries) > self.capacity:
+            self._evict_worst()
+
+    def states(self) -> List:
+        return [entry[2] for entry in self._entries]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "capacity": self.capacity,
+            "pushed": self.pushed,
+            "duplicates": self.duplicates,
+            "similar_rejected": self.similar_rejected,
+            "rejected": self.rejected,
+            "evicted": self.evicted
+        }
+
+    def _evict_worst(self):
+        self._keys.discard(self._entries.pop()[2].key)
+        self.evicted += 1
+
+    def _find_similar(self, state) -> Optional[tuple]:
+        assignment = state.assignment()
+        for entry in self._entries:
+            other = entry[2].assignment()
+            if len(other) != len(assignment):
+                continue
+            if _hamming(assignment, other, self.min_diversity) < self.min_diversity:
+                return entry
+        return None
+
+def _hamming(a: Sequence[Hashable], b: Sequence[Hashable], limit: int) -> int:
+    differences = 0
+    for x, y in zip(a, b):
+        if x != y:
+            differences += 1
+            if differences >= limit:
+                break
+    return differences
@@ -0,0 +1,49 @@
+from typing import Dict, Hashable, List, Optional
+
+class CandidateCache:
+    """Per-solve cache of slot candidates keyed by (slot_id, current slot pattern).
+
+    A slot's candidates only depend on the letters already sitting in its own cells,
+    so the pattern is a complete key. Empty results are cached too, which lets dead
+    patterns be rejected without going back to the dictionary.
+    """
+
+    def __init__(self):
+        self._entries: Dict[tuple, List] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def reset(self):
+        """Drop all entries and counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get(self, slot_id: Hashable, pattern: str) -> Optional[List]:
+        """Return the cached candidates, or None on a miss. Callers must not mutate the list."""
+        candidates = self._entries.get((slot_id, pattern))
+        if candidates is None:
+            self.misses += 1
+        elif candidates:
+            self.hits += 1
+        else:
+            self.negative_hits += 1
+        return candidates
+
+    def put(self, slot_id: Hashable, pattern: str, candidates: List) -> List:
+        """Store candidates for a pattern and hand them back."""
+        self._entries[(slot_id, pattern)] = candidates
+        return candidates
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for the result metrics."""
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,51 @@
+from typing import Callable, Dict, List, Optional
+
+class ResolvedClue:
+    """Dictionary lookups for one slot's clue, done once per solve.
+
+    A slot's clue never changes during a search, so the exact match, the
+    clue-matching words and the fallback pools are fetched up front. The
+    search loops then only filter these pools by the slot's current pattern.
+    """
+
+    MAX_CLUE_WORDS = 5000
+
+    def __init__(self, slot: Dict, dict_helper):
+        self.dict_helper = dict_helper
+        self.clue = slot.get('clue', '')
+        self.length = slot['length']
+
+        self.exact_match: Optional[Dict] = dict_helper.find_word_by_exact_clue(self.clue)
+        self.exact_word: Optional[str] = self.exact_match['word'].upper() if self.exact_match else None
+        self.clue_words: List[Dict] = dict_helper.get_possible_words(
+            clue=self.clue, max_words=self.MAX_CLUE_WORDS, length_range=(self.length, self.length)
+        )
+
+        self._alternative_spellings: Dict[int, List[Dict]] = {}
+        self._length_pools: Dict[int, List[Dict]] = {}
+
+    def clue_matches(self, max_words: int) -> List[Dict]:
+        """Same words as get_possible_words(clue, max_words, (length, length))."""
+        return self.clue_words[:max_words]
+
+    def alternative_spellings(self, max_words: int = 20, should_stop: Optional[Callable[[], bool]] = None) -> List[Dict]:
+        """Fuzzy clue matches, computed on first use since they are only needed as a fallback.
+
+        A scan cut short by `should_stop` is returned but not kept.
+        """
+        if max_words in self._alternative_spellings:
+            return self._alternative_spellings[max_words]
+        words = self.dict_helper.get_alternative_spellings(
+            self.clue, self.length, max_words=max_words, should_stop=should_stop
+        )
+        if should_stop is None or not should_stop():
+            self._alternative_spellings[max_words] = words
+        return words
+
+    def length_pool(self, max_words: int) -> List[Dict]:
+        """Best-scoring words of the slot's length, independent of the clue."""
+        if max_words not in self._length_pools:
+            self._length_pools[max_words] = list(
+                self.dict_helper.get_words_by_length(self.length, max_words=max_words)
+            )
+        return self._length_pools[max_words]
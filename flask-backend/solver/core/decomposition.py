@@ -0,0 +1,86 @@
+from typing import Dict, List
+from .slot_manager import SlotManager
+
+def split_puzzle(grid: List[List[str]], clues: Dict[str, List[Dict]]) -> List[Dict[str, List[Dict]]]:
+    """Split the clues into one clue set per independent region of unfilled slots.
+
+    Every clue set can be solved on the full grid by itself, since no two regions
+    share an empty cell. A connected puzzle comes back as a single clue set.
+    """
+    solution = [[cell if cell not in [' ', '.'] else '.' for cell in row] for row in grid]
+    slot_manager = SlotManager(solution, clues)
+    slots = slot_manager.get_word_slots()
+    components = slot_manager.find_components(slots, slot_manager.build_slot_graph(slots))
+
+    clue_sets = []
+    for component in components:
+        keys = {(slot['number'], slot['direction']) for slot in component}
+        clue_sets.append({
+            direction: [clue for clue in clues.get(direction, []) if (clue['number'], direction) in keys]
+            for direction in ('across', 'down')
+        })
+    return clue_sets
+
+def merge_component_results(results: List[Dict]) -> Dict:
+    """Combine per-region solver results into one result for the whole grid.
+
+    Regions are solved independently, so the merged grid takes every letter any
+    region placed, and the puzzle is solved only if every region is.
+    """
+    merged = dict(results[0])
+    grid = [row[:] for row in results[0]["grid"]]
+    for result in results[1:]:
+        for y, row in enumerate(result["grid"]):
+            for x, cell in enumerate(row):
+                if cell != '.':
+                    grid[y][x] = cell
+
+    if all(result["status"] == "success" for result in results):
+        status = "success"
+    elif any(result["status"] == "timeout" for result in results):
+        status = "timeout"
+    else:
+        status = "partial"
+
+    merged.update({
+        "status": status,
+        "grid": grid,
+        "words_placed": sum(result["words_placed"] for result in results),
+        "total_words": sum(result["total_words"] for result in results),
+        "execution_time": max(result["execution_time"] for result in results),
+        "peak_memory_kb": max(result["peak_memory_kb"] for result in results),
+        "fallback_usage_count": sum(result["fallback_usage_count"] for result in results),
+        "time_complexity": {
+            **results[0]["time_complexity"],
+            "operations": sum(result["time_complexity"]["operations"] for result in results)
+        },
+        "quality": _merge_quality([result["quality"] for result in results]),
+        "candidate_cache": _merge_cache_stats([result["candidate_cache"] for result in results]),
+        "stopped": any(result.get("stopped") for result in results),
+        "stop_reason": next((result["stop_reason"] for result in results if result.get("stop_reason")), None),
+        "components": [
+            {
+                "status": result["status"],
+                "words_placed": result["words_placed"],
+                "total_words": result["total_words"],
+                "execution_time": round(result["execution_time"], 4)
+            }
+            for result in results
+        ]
+    })
+    for key in ("beam_stats", "phase_report"):
+        merged.pop(key, None)
+    return merged
+
+def _merge_quality(qualities: List[Dict]) -> Dict:
+    merged = {key: sum(entry[key] for entry in qualities)
+              for key in ("slots_filled", "total_slots", "cells_filled", "total_cells")}
+    merged["fill_ratio"] = round(merged["slots_filled"] / merged["total_slots"], 4) if merged["total_slots"] else 1.0
+    merged["cell_ratio"] = round(merged["cells_filled"] / merged["total_cells"], 4) if merged["total_cells"] else 1.0
+    return merged
+
+def _merge_cache_stats(stats: List[Dict]) -> Dict:
+    merged = {key: sum(entry.get(key, 0) for entry in stats) for key in ("hits", "negative_hits", "misses", "entries")}
+    lookups = merged["hits"] + merged["negative_hits"] + merged["misses"]
+    merged["hit_rate"] = round((merged["hits"] + merged["negative_hits"]) / lookups, 4) if lookups else 0.0
+    return merged
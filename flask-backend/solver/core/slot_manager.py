@@ -72,4 +72,45 @@ class SlotManager:
                             graph[slot1].add(slot2)
                             graph[slot2].add(slot1)
         
-        return graph
\ No newline at end of file
+        return graph
+
+    def find_components(self, slots: List[Dict], slot_graph: Dict[Tuple[int, str], Set[Tuple[int, str]]]) -> List[List[Dict]]:
+        """Group slots into independent regions.
+
+        Two slots depend on each other only if they cross at a cell that is still
+        empty; a crossing whose letter is already in the grid constrains both slots
+        separately. Components come out in the order of their first slot.
+        """
+        slots_by_key = {(slot['number'], slot['direction']): slot for slot in slots}
+        order = {key: i for i, key in enumerate(slots_by_key)}
+        seen = set()
+        components = []
+
+        for slot in slots:
+            start = (slot['number'], slot['direction'])
+            if start in seen:
+                continue
+
+            seen.add(start)
+            stack = [start]
+            component = []
+            while stack:
+                key = stack.pop()
+                component.append(slots_by_key[key])
+                for other in slot_graph.get(key, ()):
+                    if other in seen or other not in slots_by_key:
+                        continue
+                    x, y = self._crossing_cell(slots_by_key[key], slots_by_key[other])
+                    if self.grid[y][x] != '.':
+                        continue
+                    seen.add(other)
+                    stack.append(other)
+
+            components.append(sorted(component, key=lambda s: order[(s['number'], s['direction'])]))
+
+        return components
+
+    def _crossing_cell(self, slot: Dict, other: Dict) -> Tuple[int, int]:
+        if slot['direction'] == 'across':
+            return other['x'], slot['y']
+        return slot['x'], other['y']
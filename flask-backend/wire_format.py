@@ -0,0 +1,74 @@
+import gzip
+import zlib
+from typing import List, Union
+
+GRID_ENCODINGS = ("cells", "rows", "rle")
+BLANK = '.'
+
+Grid = List[Union[List[str], str]]
+
+def parse_encoding(value) -> str:
+    """The grid encoding a request asks for; raises ValueError for an unknown one."""
+    if value not in GRID_ENCODINGS:
+        raise ValueError(f"encoding must be one of {', '.join(GRID_ENCODINGS)}")
+    return value
+
+def encode_grid(grid: List[List[str]], encoding: str) -> Grid:
+    """Write a grid of one-character cells in `encoding`.
+
+    "cells" leaves the usual list of lists. "rows" turns each row into one string
+    and "rle" additionally writes every run of two or more equal cells as its
+    count and the cell, so "....AB..." becomes "4.AB3.". Both compact forms keep
+    one character per cell, so clue numbers in an empty grid become blank cells;
+    the clues carry them anyway.
+    """
+    if encoding == "cells":
+        return grid
+    rows = ["".join(cell if len(cell) == 1 and not cell.isdigit() else BLANK for cell in row) for row in grid]
+    if encoding == "rows":
+        return rows
+    return [_run_length(row) for row in rows]
+
+def decode_grid(grid, max_width: int):
+    """Turn a grid sent in any encoding back into lists of cells.
+
+    String rows are read as "rle", which also covers "rows" since cells are never
+    digits; list rows and anything that is not a grid are left for validation.
+    Raises ValueError for a row that would expand past `max_width` cells.
+    """
+    if not isinstance(grid, list):
+        return grid
+    return [_expand(row, max_width) if isinstance(row, str) else row for row in grid]
+
+def _run_length(row: str) -> str:
+    parts = []
+    start = 0
+    while start < len(row):
+        end = start
+        while end < len(row) and row[end] == row[start]:
+            end += 1
+        parts.append(row[start] if end - start == 1 else f"{end - start}{row[start]}")
+        start = end
+    return "".join(parts)
+
+def _expand(row: str, max_width: int) -> List[str]:
+    cells = []
+    count = ""
+    for char in row:
+        if char.isdigit():
+            count += char
+            continue
+        run = int(count) if count else 1
+        if len(cells) + run > max_width:
+            raise ValueError(f"grid rows may be at most {max_width} cells wide")
+        cells.extend([char] * run)
+        count = ""
+    if count:
+        raise ValueError("grid rows may not end with a run length")
+    return cells
+
+def compress(data: bytes, coding: str, level: int = 6) -> bytes:
+    """Compress a response body for the "gzip" or "deflate" Content-Encoding."""
+    if coding == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    return zlib.compress(data, level)
@@ -0,0 +1,686 @@
+import contextlib
+import itertools
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import psutil
+
+from generator.puzzle_builder import (MAX_GENERATION_TRIES, build_attempt, build_puzzle, finish_build,
+                                      in_density_bounds, needs_unbudgeted_attempt, new_seed, pick_puzzle,
+                                      plan_build)
+from solver.algorithms.factory import create_solver
+from solver.core.decomposition import merge_component_results
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Time an isolated run gets after its deadline to stop cooperatively and send back its partial result.
+ISOLATED_GRACE_SECONDS = 2.0
+
+# Per run slot: operations, slots filled summed over the run's calls, most slots filled by any one call.
+PROGRESS_FIELDS = 3
+
+_worker_dict_helper = None
+_worker_cancel_flags = None
+_worker_progress = None
+_worker_subtree_run = (None, None, None)
+
+def _pool_context():
+    # Forked workers inherit the already loaded dictionary instead of parsing it again.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+def _init_worker(dict_helper, cancel_flags, progress):
+    global _worker_dict_helper, _worker_cancel_flags, _worker_progress
+    _worker_dict_helper = dict_helper
+    _worker_cancel_flags = cancel_flags
+    _worker_progress = progress
+
+def _relay_progress(slot: int) -> Callable[[Dict], None]:
+    """A solver progress callback that adds one call's progress to its run's shared counters."""
+    last = {"operations": 0, "slots_filled": 0}
+
+    def relay(snapshot: Dict):
+        base = slot * PROGRESS_FIELDS
+        with _worker_progress.get_lock():
+            _worker_progress[base] += snapshot["operations"] - last["operations"]
+            _worker_progress[base + 1] += snapshot["best_slots_filled"] - last["slots_filled"]
+            _worker_progress[base + 2] = max(_worker_progress[base + 2], snapshot["best_slots_filled"])
+        last.update(operations=snapshot["operations"], slots_filled=snapshot["best_slots_filled"])
+    return relay
+
+def _warm_up() -> int:
+    return len(_worker_dict_helper.all_words)
+
+def _run_solver(algorithm: str, grid: List[List[str]], clues: Dict[str, List[Dict]],
+                enable_memory_profiling: bool, hybrid_options: Optional[Dict], cancel_slot: int,
+                time_limit: Optional[float] = None, deadline: Optional[float] = None) -> Dict:
+    started = time.time()
+    solver = create_solver(algorithm, grid, clues, _worker_dict_helper,
+                           enable_memory_profiling=enable_memory_profiling, hybrid_options=hybrid_options)
+    solver.stop_check = lambda: _worker_cancel_flags[cancel_slot] != 0
+    solver.progress_callback = _relay_progress(cancel_slot)
+    # `time_limit` counts from when a worker picks the call up; `deadline` is shared by every call of a run.
+    solver.set_time_limit(time_limit)
+    if deadline is not None:
+        solver.deadline = min(deadline, solver.deadline or deadline)
+    result = solver.solve()
+    solver.progress_callback(solver.progress_snapshot())
+    result["wall_time"] = time.time() - started
+    return result
+
+def _build_puzzle(size: int, difficulty: str) -> Dict:
+    return build_puzzle(size, difficulty, _worker_dict_helper)
+
+def _build_attempt(size: int, difficulty: str, attempt: int, initial_length: int, seed: int, slot: int,
+                   deadline: Optional[float]) -> Optional[Dict]:
+    if _worker_cancel_flags[slot]:
+        return None
+    return build_attempt(size, difficulty, attempt, initial_length, _worker_dict_helper, seed, deadline)
+
+def _run_dfs_subtree(run_id: int, run_block: str, prefix: List[str], cancel_slot: int,
+                     deadline: Optional[float] = None) -> Optional[Dict]:
+    """Search the subtree under `prefix`; the run's grid, clues and slot candidates are read
+    once per worker from the shared memory block `run_block`."""
+    global _worker_subtree_run
+    if _worker_cancel_flags[cancel_slot]:
+        return None
+    started = time.process_time()
+    # Later subtrees of the same run reuse the solver and the clues it has already resolved.
+    cached_run_id, solver, slot_candidates = _worker_subtree_run
+    if cached_run_id != run_id:
+        block = shared_memory.SharedMemory(name=run_block)
+        try:
+            grid, clues, slot_candidates = pickle.loads(block.buf)
+        finally:
+            block.close()
+        solver = create_solver("DFS", grid, clues, _worker_dict_helper)
+        solver.stop_check = lambda: _worker_cancel_flags[cancel_slot] != 0
+        solver.deadline = deadline
+        _worker_subtree_run = (run_id, solver, slot_candidates)
+    solver.progress_callback = _relay_progress(cancel_slot)
+    result = solver.solve_subtree(prefix, slot_candidates)
+    solver.progress_callback(solver.progress_snapshot())
+    result["cpu_time"] = time.process_time() - started
+    result["nodes_visited"] = solver.nodes_visited
+    result["worker"] = os.getpid()
+    return result
+
+@contextlib.contextmanager
+def _run_block(payload) -> Iterator[str]:
+    """Pickle `payload` into a shared memory block for the duration of one run and yield its name."""
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    block = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        block.buf[:len(data)] = data
+        yield block.name
+    finally:
+        block.close()
+        block.unlink()
+
+def _slot_count(clues: Dict[str, List[Dict]]) -> int:
+    return len(clues.get("across", [])) + len(clues.get("down", []))
+
+def _limit_memory(memory_limit_mb: Optional[int]):
+    """Cap this process's address space at its current size plus `memory_limit_mb`.
+
+    A forked worker already maps everything the server had loaded, so the budget is
+    counted on top of that rather than as an absolute size.
+    """
+    if not memory_limit_mb or resource is None:
+        return
+    limit = psutil.Process().memory_info().vms + memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _isolated_main(conn, algorithm: str, grid: List[List[str]], clues: Dict[str, List[Dict]], dict_helper,
+                   enable_memory_profiling: bool, time_limit: float, memory_limit_mb: Optional[int]):
+    try:
+        _limit_memory(memory_limit_mb)
+        deadline = time.time() + time_limit
+        solver = create_solver(algorithm, grid, clues, dict_helper, enable_memory_profiling=enable_memory_profiling)
+        solver.deadline = deadline
+        started = time.time()
+        result = solver.solve()
+        conn.send({
+            "status": "timeout" if result.get("stop_reason") == "timeout" else "completed",
+            "result": result,
+            "complexity_tracker": solver.complexity_tracker,
+            "wall_time": time.time() - started
+        })
+    except MemoryError:
+        solver = None  # free the search state so the report below can be allocated
+        conn.send({"status": "memory_exceeded", "error": f"exceeded {memory_limit_mb} MB"})
+    except Exception as e:
+        conn.send({"status": "error", "error": str(e)})
+    finally:
+        conn.close()
+
+def run_isolated(algorithms: Iterable[str], grid: List[List[str]], clues: Dict[str, List[Dict]], dict_helper,
+                 time_limit: float, memory_limit_mb: Optional[int] = None,
+                 enable_memory_profiling: bool = False) -> Dict[str, Dict]:
+    """Run each algorithm in its own process, all at once, with its own time and memory budget.
+
+    Each outcome has a `status` of completed, timeout, memory_exceeded or error.
+    A run that hits its deadline stops cooperatively and still returns its
+    partial `result`. One that does not answer within the grace period is
+    killed and has no result.
+    """
+    context = _pool_context()
+    runs = {}
+    for algorithm in algorithms:
+        reader, writer = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_isolated_main,
+            args=(writer, algorithm, grid, clues, dict_helper, enable_memory_profiling, time_limit, memory_limit_mb),
+            daemon=True
+        )
+        process.start()
+        writer.close()
+        runs[reader] = (algorithm, process, time.time())
+
+    outcomes: Dict[str, Dict] = {}
+    deadline = time.time() + time_limit + ISOLATED_GRACE_SECONDS
+    while runs:
+        ready = multiprocessing.connection.wait(list(runs), timeout=max(0.0, deadline - time.time()))
+        if not ready:
+            break
+        for reader in ready:
+            algorithm, process, started = runs.pop(reader)
+            try:
+                outcomes[algorithm] = reader.recv()
+            except EOFError:
+                process.join(1)
+                outcomes[algorithm] = {"status": "error", "error": f"worker exited with code {process.exitcode}"}
+            reader.close()
+            process.join(1)
+            outcomes[algorithm].setdefault("wall_time", time.time() - started)
+
+    for reader, (algorithm, process, started) in runs.items():
+        logger.warning(f"{algorithm} ignored its {time_limit}s deadline, terminating it")
+        process.terminate()
+        process.join(1)
+        reader.close()
+        outcomes[algorithm] = {"status": "timeout", "wall_time": time.time() - started}
+
+    return outcomes
+
+
+class SolverPool:
+    """Pre-started worker processes that already hold the dictionary.
+
+    Every portfolio run borrows one slot of a shared flag array. Setting the flag
+    makes each engine of that run stop at its next search step, and the slot is
+    only handed out again once all of the run's engines have returned.
+    """
+
+    PORTFOLIO = ("DFS", "A*", "HYBRID")
+    STOP_POLL_INTERVAL = 0.1
+    PROGRESS_INTERVAL = 0.5
+    SUBTREES_PER_WORKER = 4
+    MAX_SPLIT_DEPTH = 4
+
+    def __init__(self, dict_helper, workers: int = 3, max_concurrent_runs: int = 32):
+        self.dict_helper = dict_helper
+        self.workers = max(1, workers)
+        self._context = _pool_context()
+        self._cancel_flags = self._context.RawArray('b', max_concurrent_runs)
+        self._progress = self._context.Array('q', max_concurrent_runs * PROGRESS_FIELDS)
+        self._free_slots = list(range(max_concurrent_runs))
+        self._slot_refs = [0] * max_concurrent_runs
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._run_ids = itertools.count()
+
+    def start(self) -> ProcessPoolExecutor:
+        """Create the workers if needed and have each of them load its state."""
+        with self._lock:
+            if self._executor is None:
+                # Workers forked after this share the server's tracker, so the run blocks they
+                # attach to are not reported as leaked by a tracker of their own.
+                resource_tracker.ensure_running()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=self._context,
+                    initializer=_init_worker,
+                    initargs=(self.dict_helper, self._cancel_flags, self._progress)
+                )
+                for _ in range(self.workers):
+                    self._executor.submit(_warm_up)
+                logger.info(f"Solver pool started with {self.workers} workers")
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def generate(self, size: int, difficulty: str) -> Future:
+        """Build one puzzle on a worker; the future holds the /generate body or a PuzzleBuildError."""
+        return self.start().submit(_build_puzzle, size, difficulty)
+
+    def build_puzzle(self, size: int, difficulty: str,
+                     on_attempt: Optional[Callable[[int, int], None]] = None, seed: Optional[int] = None,
+                     time_budget: Optional[float] = None) -> Dict:
+        """Build one puzzle with its generation attempts spread over the workers.
+
+        Each attempt runs from its own seed, derived from `seed` exactly as the
+        sequential build does. Attempts are taken in order: the first to land inside
+        the difficulty's density bounds wins once every earlier one has missed, and
+        the rest are cancelled; if none lands, the densest does. So the same seed
+        gives the same puzzle however the attempts are scheduled. At most one attempt
+        per worker is queued at a time, so a build leaves room for other requests.
+        `on_attempt(attempt, max_attempts)` is called as each attempt finishes,
+        counting from 0, and before the retry below, and may raise to abandon the
+        build. After `time_budget` seconds no more attempts are queued, running ones
+        stop expanding and the best puzzle so far is taken; if there is none yet (a
+        short budget on a cold pool), the first attempt is run again without the
+        budget rather than failing the build.
+        """
+        deadline = time.time() + time_budget if time_budget else None
+        seed = new_seed() if seed is None else seed
+        initial_length, attempt_seeds = plan_build(size, difficulty, self.dict_helper, seed)
+        best_puzzle = None
+        with self._run_slot() as slot:
+            queued = iter(range(MAX_GENERATION_TRIES))
+            pending = {}
+            finished = {}
+            next_attempt = attempts_done = 0
+
+            def submit_next():
+                if deadline is not None and time.time() >= deadline:
+                    return
+                for attempt in itertools.islice(queued, 1):
+                    call = (_build_attempt, (size, difficulty, attempt, initial_length, attempt_seeds[attempt], slot, deadline))
+                    pending[self._submit([call], slot)[0]] = attempt
+
+            try:
+                for _ in range(self.workers):
+                    submit_next()
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        attempt = pending.pop(future)
+                        if on_attempt:
+                            on_attempt(attempts_done, MAX_GENERATION_TRIES)
+                        attempts_done += 1
+                        try:
+                            finished[attempt] = future.result()
+                        except Exception as e:
+                            logger.error(f"Generation attempt failed: {str(e)}")
+                            finished[attempt] = None
+                        submit_next()
+                    while next_attempt in finished:
+                        puzzle = finished.pop(next_attempt)
+                        if puzzle is not None and in_density_bounds(puzzle):
+                            return finish_build(puzzle, seed, deadline)
+                        best_puzzle = pick_puzzle(best_puzzle, puzzle)
+                        next_attempt += 1
+            finally:
+                if pending:
+                    self._cancel_flags[slot] = 1
+                    for future in pending:
+                        future.cancel()
+
+            if needs_unbudgeted_attempt(best_puzzle, deadline):
+                # Still goes through on_attempt, so a cancelled build is abandoned here as well.
+                if on_attempt:
+                    on_attempt(attempts_done, MAX_GENERATION_TRIES)
+                call = (_build_attempt, (size, difficulty, 0, initial_length, attempt_seeds[0], slot, None))
+                try:
+                    best_puzzle = self._submit([call], slot)[0].result()
+                except Exception as e:
+                    logger.error(f"Generation attempt failed: {str(e)}")
+        return finish_build(best_puzzle, seed, deadline)
+
+    def run_portfolio(self, grid: List[List[str]], clues: Dict[str, List[Dict]],
+                      enable_memory_profiling: bool = False, hybrid_options: Optional[Dict] = None,
+                      time_limit: Optional[float] = None, stop_check: Optional[Callable[[], bool]] = None,
+                      progress_callback: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Race every engine on the same puzzle and return the first complete solution.
+
+        If no engine succeeds, the partial fill with the most words wins. The report
+        lists each engine's status and time; engines still running when the winner
+        is known are cancelled and reported with the time they had spent so far.
+        Once `stop_check()` is true every engine stops and reports its partial fill;
+        `progress_callback` gets a snapshot of the engines' combined progress every half second.
+        """
+        with self._run_slot() as slot:
+            started = time.time()
+            on_progress = self._progress_relay(slot, "portfolio", _slot_count(clues), False, progress_callback)
+            deadline = started + time_limit if time_limit else None
+            calls = [(_run_solver, (algorithm, grid, clues, enable_memory_profiling, hybrid_options, slot, None, deadline))
+                     for algorithm in self.PORTFOLIO]
+            futures = dict(zip(self._submit(calls, slot), self.PORTFOLIO))
+
+            results: Dict[str, Dict] = {}
+            errors: Dict[str, str] = {}
+            winner = None
+            pending = set(futures)
+            while pending and winner is None:
+                done, pending = self._wait(pending, slot, stop_check, on_progress)
+                for future in done:
+                    algorithm = futures[future]
+                    try:
+                        results[algorithm] = future.result()
+                    except Exception as e:
+                        logger.error(f"Portfolio engine {algorithm} failed: {str(e)}")
+                        errors[algorithm] = str(e)
+                        continue
+                    if winner is None and results[algorithm].get("status") == "success":
+                        winner = algorithm
+
+            if pending:
+                self._cancel_flags[slot] = 1
+                for future in pending:
+                    future.cancel()
+        elapsed = time.time() - started
+
+        if winner is None:
+            if not results:
+                raise RuntimeError(f"All portfolio engines failed: {errors}")
+            winner = max(results, key=lambda algorithm: results[algorithm].get("words_placed", 0))
+
+        engines = {}
+        for algorithm in self.PORTFOLIO:
+            if algorithm in results:
+                result = results[algorithm]
+                engines[algorithm] = {
+                    "status": result.get("status"),
+                    "time_ms": round(result["wall_time"] * 1000, 2),
+                    "words_placed": result.get("words_placed", 0)
+                }
+            elif algorithm in errors:
+                engines[algorithm] = {"status": "error", "error": errors[algorithm]}
+            else:
+                engines[algorithm] = {"status": "cancelled", "time_ms": round(elapsed * 1000, 2)}
+
+        return {"winner": winner, "result": results[winner], "engines": engines}
+
+    def run_components(self, algorithm: str, grid: List[List[str]], clue_sets: List[Dict[str, List[Dict]]],
+                       enable_memory_profiling: bool = False, hybrid_options: Optional[Dict] = None,
+                       time_limit: Optional[float] = None, stop_check: Optional[Callable[[], bool]] = None,
+                       progress_callback: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Solve the independent regions of one puzzle side by side and merge the results.
+
+        Once `stop_check()` is true every region stops and the partial fills are merged;
+        `progress_callback` gets a snapshot of all regions' progress every half second.
+        """
+        with self._run_slot() as slot:
+            on_progress = self._progress_relay(slot, "components", sum(_slot_count(clue_set) for clue_set in clue_sets),
+                                               True, progress_callback)
+            deadline = time.time() + time_limit if time_limit else None
+            calls = [(_run_solver, (algorithm, grid, clue_set, enable_memory_profiling, hybrid_options, slot, None, deadline))
+                     for clue_set in clue_sets]
+            futures = self._submit(calls, slot)
+            pending = set(futures)
+            while pending:
+                _, pending = self._wait(pending, slot, stop_check, on_progress)
+            return merge_component_results([future.result() for future in futures])
+
+    def run_parallel_dfs(self, grid: List[List[str]], clues: Dict[str, List[Dict]],
+                         split_depth: Optional[int] = None, time_limit: Optional[float] = None,
+                         stop_check: Optional[Callable[[], bool]] = None,
+                         progress_callback: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Split the DFS tree at its first slots and search the subtrees on every worker.
+
+        Subtrees are queued in the order the serial search would visit them and idle
+        workers pull the next one, so a worker that finishes a small subtree early
+        takes over remaining work instead of waiting. The first subtree to
+        finish with a solution stops the rest. Without `split_depth`, the tree is split
+        one slot deeper at a time until there are a few subtrees per worker.
+        `time_limit` covers the split and every subtree together. Once `stop_check()`
+        is true the split and every subtree stop, and the fullest fill so far is returned.
+        `progress_callback` gets the subtrees' combined progress every half second.
+        """
+        started = time.time()
+        deadline = started + time_limit if time_limit else None
+        splitter = create_solver("DFS", grid, clues, self.dict_helper)
+        splitter.deadline = deadline
+        splitter.stop_check = stop_check
+        if split_depth is None:
+            split_depth = 1
+            prefixes = splitter.split_search(split_depth)
+            while (len(prefixes) < self.SUBTREES_PER_WORKER * self.workers
+                   and split_depth < min(self.MAX_SPLIT_DEPTH, len(splitter.slot_candidates))):
+                split_depth += 1
+                prefixes = splitter.split_search(split_depth)
+        else:
+            prefixes = splitter.split_search(split_depth)
+        split_time = time.time() - started
+
+        if not prefixes:
+            # Nothing to hand out: no slot has candidates or the first slots cannot be filled consistently.
+            result = splitter.solve()
+            result["parallel"] = {"split_depth": split_depth, "subtrees": 0, "split_ms": round(split_time * 1000, 2)}
+            return result
+
+        with self._run_slot() as slot:
+            on_progress = self._progress_relay(slot, "parallel_dfs", _slot_count(clues), False, progress_callback)
+            run_id = next(self._run_ids)
+            # The slot candidates can run to thousands of words, so they are pickled once for
+            # the whole run rather than into every call; each call carries only its prefix.
+            with _run_block((grid, clues, splitter.slot_candidates)) as run_block:
+                calls = [(_run_dfs_subtree, (run_id, run_block, prefix, slot, deadline)) for prefix in prefixes]
+                futures = self._submit(calls, slot)
+
+                results = []
+                winner = None
+                pending = set(futures)
+                while pending and winner is None:
+                    done, pending = self._wait(pending, slot, stop_check, on_progress)
+                    for result in self._collect_subtrees(done):
+                        results.append(result)
+                        if winner is None and result.get("status") == "success":
+                            winner = result
+
+                if pending:
+                    self._cancel_flags[slot] = 1
+                    for future in pending:
+                        future.cancel()
+                    # Subtrees that were already running report the work they did before stopping.
+                    wait(pending)
+                    results.extend(self._collect_subtrees(pending))
+        wall_time = time.time() - started
+
+        if winner is None:
+            if not results:
+                raise RuntimeError("Every DFS subtree failed")
+            winner = max(results, key=lambda result: result.get("words_placed", 0))
+
+        workers: Dict[int, Dict] = {}
+        for result in results:
+            stats = workers.setdefault(result["worker"], {"subtrees": 0, "nodes_visited": 0, "cpu_ms": 0.0})
+            stats["subtrees"] += 1
+            stats["nodes_visited"] += result["nodes_visited"]
+            stats["cpu_ms"] += result["cpu_time"] * 1000
+        cpu_time = sum(result["cpu_time"] for result in results)
+
+        winner = dict(winner)
+        winner["execution_time"] = wall_time
+        winner["parallel"] = {
+            "split_depth": split_depth,
+            "subtrees": len(prefixes),
+            "subtrees_searched": len(results),
+            "split_ms": round(split_time * 1000, 2),
+            "total_nodes_visited": sum(result["nodes_visited"] for result in results),
+            "total_cpu_ms": round(cpu_time * 1000, 2),
+            "wall_ms": round(wall_time * 1000, 2),
+            "parallelism": round(cpu_time / wall_time, 2) if wall_time else 0.0,
+            "workers": [
+                {"pid": pid, **stats, "cpu_ms": round(stats["cpu_ms"], 2)}
+                for pid, stats in sorted(workers.items())
+            ]
+        }
+        return winner
+
+    def run_batch(self, items: List[Dict], time_limit: Optional[float] = None,
+                  max_in_flight: Optional[int] = None) -> Iterator[Dict]:
+        """Solve many puzzles on the pool and yield each outcome as soon as it is ready.
+
+        Items are dicts with `algorithm`, `grid`, `clues` and optional `hybrid_options`.
+        At most `max_in_flight` of them are queued at once and the next one goes in
+        as each returns, so a large batch never floods the executor queue ahead of
+        other requests. Outcomes come in completion order and carry the item's
+        `index`. Each item stops at its own `time_limit` and still reports its
+        partial fill. Closing the generator early cancels the unfinished items.
+        """
+        max_in_flight = max(1, max_in_flight or self.workers)
+        with self._run_slot() as slot:
+            queued = iter(enumerate(items))
+            pending = {}
+
+            def submit_next():
+                for index, item in itertools.islice(queued, 1):
+                    call = (_run_solver, (item["algorithm"], item["grid"], item["clues"], False,
+                                          item.get("hybrid_options"), slot, time_limit))
+                    pending[self._submit([call], slot)[0]] = index
+
+            try:
+                for _ in range(max_in_flight):
+                    submit_next()
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        submit_next()
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            logger.error(f"Batch item {index} failed: {str(e)}")
+                            yield {"index": index, "error": str(e)}
+                            continue
+                        yield {"index": index, "result": result, "timed_out": result.get("stop_reason") == "timeout"}
+            finally:
+                if pending:
+                    self._cancel_flags[slot] = 1
+                    for future in pending:
+                        future.cancel()
+
+    def _wait(self, pending, slot: int, stop_check: Optional[Callable[[], bool]],
+              on_progress: Optional[Callable[[], None]] = None):
+        """wait(FIRST_COMPLETED) that raises the run's cancel flag once `stop_check()` is true.
+
+        Calls already running see the flag and return their partial results, and
+        queued ones return as soon as they start, so every call of the run still reports.
+        `on_progress()` is called at every poll while the run is waited on.
+        """
+        polling = stop_check is not None or on_progress is not None
+        while True:
+            done, pending = wait(pending, timeout=self.STOP_POLL_INTERVAL if polling else None,
+                                 return_when=FIRST_COMPLETED)
+            if on_progress is not None:
+                on_progress()
+            if done:
+                return done, pending
+            if stop_check is not None and not self._cancel_flags[slot] and stop_check():
+                logger.info("Pool run stopped by its caller")
+                self._cancel_flags[slot] = 1
+
+    def _progress_relay(self, slot: int, phase: str, total_slots: int, sum_regions: bool,
+                        progress_callback: Optional[Callable[[Dict], None]]) -> Optional[Callable[[], None]]:
+        """An `on_progress` for _wait that reports the run's shared counters at most every PROGRESS_INTERVAL.
+
+        Snapshots have the fields of a solver's progress snapshot; slots filled are
+        summed over the calls when they search separate regions (`sum_regions`) and
+        the best single call's otherwise. The grid and memory are not relayed.
+        """
+        if progress_callback is None:
+            return None
+        started = time.time()
+        last = {"time": started, "operations": 0}
+
+        def on_progress():
+            now = time.time()
+            if now - last["time"] < self.PROGRESS_INTERVAL:
+                return
+            base = slot * PROGRESS_FIELDS
+            with self._progress.get_lock():
+                operations, filled_sum, filled_max = self._progress[base:base + PROGRESS_FIELDS]
+            slots_filled = filled_sum if sum_regions else filled_max
+            progress_callback({
+                "elapsed_ms": round((now - started) * 1000, 2),
+                "phase": phase,
+                "operations": operations,
+                "operations_per_second": round((operations - last["operations"]) / (now - last["time"]), 1),
+                "slots_filled": slots_filled,
+                "best_slots_filled": slots_filled,
+                "total_slots": total_slots,
+                "best_grid": None,
+                "memory_kb": None
+            })
+            last.update(time=now, operations=operations)
+        return on_progress
+
+    def _collect_subtrees(self, futures) -> List[Dict]:
+        results = []
+        for future in futures:
+            if future.cancelled():
+                continue
+            if future.exception() is not None:
+                logger.error(f"DFS subtree failed: {future.exception()}")
+                continue
+            if future.result() is not None:
+                results.append(future.result())
+        return results
+
+    def _submit(self, calls: List[tuple], slot: int) -> List:
+        """Queue (function, args) calls for the run holding `slot`."""
+        for attempt in range(2):
+            executor = self.start()
+            futures = []
+            try:
+                for function, args in calls:
+                    future = executor.submit(function, *args)
+                    with self._lock:
+                        self._slot_refs[slot] += 1
+                    future.add_done_callback(lambda _future: self._drop_slot_ref(slot))
+                    futures.append(future)
+                return futures
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a fresh pool once.
+                logger.warning("Solver pool is broken, restarting it")
+                self.shutdown()
+                if attempt:
+                    raise
+
+    @contextlib.contextmanager
+    def _run_slot(self):
+        """Borrow a cancel slot for one run.
+
+        The slot is handed out again only when the run has ended and the last call
+        it submitted has returned, so a late check never sees another run's flag.
+        """
+        with self._lock:
+            if not self._free_slots:
+                raise RuntimeError("Too many concurrent solver pool runs")
+            slot = self._free_slots.pop()
+            self._cancel_flags[slot] = 0
+            with self._progress.get_lock():
+                self._progress[slot * PROGRESS_FIELDS:(slot + 1) * PROGRESS_FIELDS] = [0] * PROGRESS_FIELDS
+            self._slot_refs[slot] = 1
+        try:
+            yield slot
+        finally:
+            self._drop_slot_ref(slot)
+
+    def _drop_slot_ref(self, slot: int):
+        with self._lock:
+            self._slot_refs[slot] -= 1
+            if self._slot_refs[slot] == 0:
+                self._cancel_flags[slot] = 0
+                self._free_slots.append(slot)